@@ -1,6 +1,6 @@
 #
 # PATCHING
-from .patch import patch_request, patch_base_field
+from .patch import patch_request, patch_base_field, patch_deferred_attribute
 
 
 default_app_config = 'drf_proj.apps.base_api.apps.ApiConfig'
@@ -8,3 +8,4 @@ default_app_config = 'drf_proj.apps.base_api.apps.ApiConfig'
 
 patch_request()
 patch_base_field()
+patch_deferred_attribute()
@@ -1,15 +1,46 @@
 from collections import Iterable
+from functools import partial
+from itertools import islice
+import logging
 import re
 
 from django.conf import settings
-from rest_framework import viewsets, exceptions, serializers, status
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, QuerySet
+from django.http import Http404, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import viewsets, exceptions, permissions, serializers, status
+from rest_framework.decorators import list_route
 from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.permissions import BasePermission
+from rest_framework.relations import ManyRelatedField
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from semantic_version import Version, Spec
 
-from .paginators import OffsetPaginator
-from .renderers import camelize
-from .serializers import PaginationSerializerMixin
+from .bulk import bulk_insert, bulk_update
+from .codes import Codes
+from .collection_delete import delete_in_chunks, get_job, start_delete_job
+from .conditional import get_validator_headers, is_not_modified, make_etag, set_validator_headers
+from .counters import ExactCount
+from .exceptions import ApiValidationError
+from .fetch_plans import get_fetch_plan, get_only_fields, build_prefetches
+from .fetching_fields import compile_fetching_fields
+from .fragment_cache import get_fragment_key, get_fragments_prefix, serialize_with_fragments
+from .instrumentation import QueryCollector, QueryBudgetExceeded
+from . import object_cache
+from .paginators import OffsetPaginator, KeysetPaginator, InvalidCursorError, InvalidOrderingError
+from .patch import pack_validation_message
+from .renderers import camelize, Camelized, JsonRenderer
+from .response_cache import (
+    cache_response, connect_invalidation, get_cached_response, get_model_tag, invalidate_models, make_response_key,
+)
+from .serializers import BaseSerializer, PaginationSerializerMixin
+from .values_plans import get_values_plan, serialize_values
+
+
+logger = logging.getLogger(__name__)
 
 
 uuid_re = re.compile(r'[a-f0-9]{32}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
@@ -32,6 +63,7 @@ class BaseView(viewsets.GenericViewSet, PaginationSerializerMixin):
     page_kwarg = settings.PAGINATE_PAGE_PARAM
     offset_kwarg = settings.PAGINATE_OFFSET_PARAM
     limit_kwarg = settings.PAGINATE_LIMIT_PARAM
+    cursor_kwarg = settings.PAGINATE_CURSOR_PARAM
     pagination_validator_class = PaginationValidator
 
     serializer_class = serializers.Serializer
@@ -45,6 +77,96 @@ class BaseView(viewsets.GenericViewSet, PaginationSerializerMixin):
 
     rst_doc = None
 
+    # sql queries instrumentation
+    query_budget = None  # max number of sql queries per request (see `query_budget_strict`)
+    query_budget_strict = settings.API_QUERY_BUDGET_STRICT  # raise `QueryBudgetExceeded` instead of logging
+    detect_n_plus_one = settings.API_DETECT_N_PLUS_ONE  # log queries repeated `n_plus_one_threshold` times
+    n_plus_one_threshold = 3
+    query_count_header = settings.API_QUERY_COUNT_HEADER  # add `X-Query-Count` header to responses
+
+    response_cache_models = ()  # models backing cached responses (the `queryset` model by default)
+
+    # read-through cache of `get_object` of safe requests (querysets must not depend on the request, filter backends
+    # are skipped; changes without save signals, e.g. `QuerySet.update()`, aren't visible until timeout)
+    cache_objects = False
+    object_cache_timeout = settings.API_OBJECT_CACHE_TIMEOUT
+    object_cache_not_found_timeout = settings.API_OBJECT_CACHE_NOT_FOUND_TIMEOUT
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        if cls.cache_objects and cls.queryset is not None:
+            # objects can be changed by processes which didn't look them up yet
+            object_cache.connect_invalidation(cls.queryset.model, cls.lookup_field)
+        return super(BaseView, cls).as_view(actions, **initkwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.query_budget is None and not self.detect_n_plus_one and not self.query_count_header:
+            return super(BaseView, self).dispatch(request, *args, **kwargs)
+
+        with QueryCollector() as queries:
+            response = super(BaseView, self).dispatch(request, *args, **kwargs)
+
+        self._check_queries(queries, response)
+        return response
+
+    def _check_queries(self, queries, response):
+        view_name = '{} ({})'.format(self.__class__.__name__, getattr(self, 'action', None))
+
+        if self.query_count_header:
+            response['X-Query-Count'] = str(queries.count)
+
+        if self.detect_n_plus_one:
+            for query in queries.repeated(threshold=self.n_plus_one_threshold):
+                logger.warning('N+1 queries in %s: %d queries (%.1fms) triggered by %s: %s',
+                               view_name, query.count, query.duration * 1000, query.trigger, query.sql)
+
+        if self.query_budget is not None and queries.count > self.query_budget:
+            message = '{} made {} sql queries ({:.1f}ms), query budget is {}'.format(
+                view_name, queries.count, queries.duration * 1000, self.query_budget)
+            if self.query_budget_strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    @classmethod
+    def get_response_cache_models(cls):
+        if cls.response_cache_models:
+            return tuple(cls.response_cache_models)
+        return (cls.queryset.model,) if cls.queryset is not None else ()
+
+    def get_object(self):
+        # objects which are changed (e.g. by `save()` of all fields) are always fetched from the database
+        if (not self.cache_objects or '__' in self.lookup_field or
+                self.request.method not in permissions.SAFE_METHODS):
+            return super(BaseView, self).get_object()
+
+        queryset = self.get_queryset()
+        model = queryset.model
+        value = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        object_cache.connect_invalidation(model, self.lookup_field)
+
+        # the key is read before the object is fetched, so a concurrent change makes the stored object outdated
+        key = object_cache.get_object_key(model, self.lookup_field, value)
+        obj = object_cache.get_cached_object(key)
+        if obj is None:
+            try:
+                obj = queryset.get(**{self.lookup_field: value})
+            except (model.DoesNotExist, TypeError, ValueError):
+                obj = object_cache.NOT_FOUND
+                object_cache.cache_object(key, obj, timeout=self.object_cache_not_found_timeout)
+            else:
+                object_cache.cache_object(key, obj, timeout=self.object_cache_timeout)
+
+        if obj == object_cache.NOT_FOUND:
+            raise Http404('No {} matches the given query.'.format(model._meta.object_name))
+
+        # permissions are checked for cached objects too
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def invalidate_response_cache(self):
+        """Invalidates cached responses of read views backed by models of this view"""
+        invalidate_models(*self.get_response_cache_models())
+
     def filter_queryset(self, queryset):
         from django.core.exceptions import ValidationError
         try:
@@ -70,6 +192,12 @@ class BaseView(viewsets.GenericViewSet, PaginationSerializerMixin):
     def get_validator_class(self):
         return self.validator_class
 
+    def _get_bulk_errors(self, errors):
+        """Errors of items are keyed by item index, so field paths are `<index>.<field>`"""
+        if isinstance(errors, list):
+            return {str(i): item_errors for i, item_errors in enumerate(errors) if item_errors}
+        return errors
+
     def get_validator_context(self):
         return self.get_serializer_context()
 
@@ -82,53 +210,23 @@ class BaseView(viewsets.GenericViewSet, PaginationSerializerMixin):
         )
 
     @property
-    def fetching_fields(self):
-        if hasattr(self, '_fetching_fields_internal'):
-            return self._fetching_fields_internal
-
-        fetching_fields = self.request.query_params.get('fields', '')
-        fetching_fields = fetching_fields.replace('.', '__')
-        if fetching_fields or self.default_fetching_fields:
-            _fields = set()
-            fetching_fields = fetching_fields.split(',') if fetching_fields else self.default_fetching_fields
-
-            for f in fetching_fields:
-                _fields.add(f)
-                if '__' in f:
-                    p = f.split('__')
-                    while p:
-                        _fields.add('__'.join(p))
-                        p = p[:-1]
-            fetching_fields = _fields
-        else:
-            fetching_fields = frozenset()
-
-        if self.fetching_fieldsets:
-            for field_set, fields in self.fetching_fieldsets.items():
-                if field_set in fetching_fields:
-                    fetching_fields.discard(field_set)
-                    fetching_fields.update(fields)
+    def compiled_fetching_fields(self):
+        if not hasattr(self, '_compiled_fetching_fields'):
+            self._compiled_fetching_fields = compile_fetching_fields(
+                self.__class__, self.request.query_params.get_terms('fields'))
+        return self._compiled_fetching_fields
 
-        self._fetching_fields_external = fetching_fields.copy() or frozenset()
-
-        # replace aliases in `fetching_fields` to use internally
-        if self.fetching_fields_aliases:
-            _aliases = fetching_fields.intersection(self.fetching_fields_aliases)
-            if _aliases:
-                for _alias in _aliases:
-                    # fetching_fields.remove(_alias)
-                    fetching_fields.add(self.fetching_fields_aliases[_alias])
-
-        self._fetching_fields_internal = fetching_fields or frozenset()
-        return fetching_fields
+    @property
+    def fetching_fields(self):
+        return self.compiled_fetching_fields.internal
 
     @property
     def fetching_fields_external(self):
-        if hasattr(self, '_fetching_fields_external'):
-            return self._fetching_fields_external
+        return self.compiled_fetching_fields.external
 
-        self.fetching_fields  # do not remove. it populates `self._fetching_fields_external`
-        return self._fetching_fields_external
+    @property
+    def fetching_fields_tree(self):
+        return self.compiled_fetching_fields.tree
 
     @property
     def version(self):
@@ -143,16 +241,221 @@ class BaseView(viewsets.GenericViewSet, PaginationSerializerMixin):
 
 class BaseReadView(BaseView):
     return_total_number = False
+    count_strategy = ExactCount()  # see `counters`
+    keyset_pagination = False  # paginate `list` by `cursor` instead of `offset`/`page`
+    detect_next_page = False  # fetch one extra item to report `has_next`/`has_previous` in `meta`
+    only_requested_fields = False  # fetch only model fields which are read by the serializer for requested `fields`
+    # serialize `list` items from `values_list()` rows if all requested fields are columns (offset pagination only)
+    values_serialization = False
+
+    stream_collection = False  # render `list` as a streaming response (memory usage doesn't depend on frame size)
+    stream_chunk_size = 100
+
+    # conditional GET (`ETag`/`Last-Modified`/304), e.g. 'updated_at'; see `get_*_validators`
+    last_modified_field = None
+
+    # cache of rendered responses, invalidated by changes of `response_cache_models` (see `response_cache`)
+    cache_responses = False
+    response_cache_scope = 'user'  # 'user' (per user), 'anonymous' (anonymous requests only) or 'shared'
+    response_cache_timeout = settings.API_RESPONSE_CACHE_TIMEOUT
+
+    # cache of serialized collection items (see `fragment_cache`)
+    cache_fragments = False
+    fragment_version_field = 'updated_at'  # the item is serialized again when the value changes
+    fragment_cache_timeout = settings.API_FRAGMENT_CACHE_TIMEOUT
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        if cls.cache_responses:
+            for model in cls.get_response_cache_models():
+                connect_invalidation(model)
+        return super(BaseReadView, cls).as_view(actions, **initkwargs)
 
     def _prepare_filtered_qs(self, qs):
         return qs
 
     def retrieve(self, request, *args, **kwargs):
-        return Response(data=self._prepare_response(self.get_object()))
+        cached = self._get_cached_response(check_object_permissions=True)
+        if cached is not None:
+            return cached
+
+        obj = self.get_object()
+        etag, last_modified = self.get_object_validators(obj)
+
+        not_modified = self._get_not_modified_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = Response(data=self._prepare_response(obj))
+        set_validator_headers(response, etag, last_modified)
+        return self._cache_response(response)
+
+    def get_object_validators(self, obj):
+        """Validators of `retrieve` response which are computed before serialization
+
+        :return: (etag, last modified datetime); (None, None) disables conditional GET
+        """
+        if not self.last_modified_field:
+            return None, None
+
+        last_modified = getattr(obj, self.last_modified_field)
+        return self._make_etag(obj.pk, last_modified), last_modified
+
+    def get_collection_validators(self, queryset):
+        """Validators of `list` response which are computed before serialization (by the whole collection)
+
+        :return: (etag, last modified datetime); (None, None) disables conditional GET
+        """
+        if not self.last_modified_field or not isinstance(queryset, QuerySet):
+            return None, None
+
+        aggregated = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count('pk'))
+        return self._make_etag(aggregated['last_modified'], aggregated['count']), aggregated['last_modified']
+
+    def _get_response_cache_key(self):
+        if not self.cache_responses:
+            return None
+
+        user = self.request.user
+        is_authenticated = bool(user and user.is_authenticated)
+        if self.response_cache_scope == 'shared':
+            scope = None
+        elif self.response_cache_scope == 'anonymous':
+            if is_authenticated:
+                return None
+            scope = None
+        else:
+            scope = user.pk if is_authenticated else None
+
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        query_params = sorted((key, sorted(values)) for key, values in self.request.query_params.lists())
+        return make_response_key(
+            parts=(
+                '{}.{}'.format(self.__class__.__module__, self.__class__.__name__),
+                getattr(self, 'action', None),
+                sorted(self.kwargs.items()),
+                getattr(self.request, 'version', None),
+                scope,
+                query_params,  # `fields`, sorting, pagination, etc.
+                getattr(renderer, 'format', None),
+                getattr(self.request, 'accepted_media_type', None),
+            ),
+            tags=[get_model_tag(model) for model in self.get_response_cache_models()],
+        )
+
+    def _has_object_permissions(self):
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def _get_cached_response(self, check_object_permissions=False):
+        """:param check_object_permissions: cached responses can be shared by users, so object permissions
+            are checked on every hit (the object is looked up by `get_object`)
+        :return: cached response, 304 response if the cached one isn't modified or None
+        """
+        self._response_cache_key = self._get_response_cache_key()
+        if self._response_cache_key is None:
+            return None
+
+        cached = get_cached_response(self._response_cache_key, view_name=self.__class__.__name__)
+        if cached is None:
+            return None
+
+        if check_object_permissions and self._has_object_permissions():
+            self.get_object()
+
+        etag, last_modified = get_validator_headers(cached)
+        not_modified = self._get_not_modified_response(etag, last_modified)
+        return cached if not_modified is None else not_modified
+
+    def _cache_response(self, response):
+        key = getattr(self, '_response_cache_key', None)
+        # streaming responses aren't cached
+        if key is not None and isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+            cache_response(key, response, timeout=self.response_cache_timeout)
+        return response
+
+    def _make_etag(self, *parts):
+        # representation depends on version and query params (`fields`, sorting, pagination)
+        query_params = sorted((key, sorted(values)) for key, values in self.request.query_params.lists())
+        return make_etag(self.__class__.__name__, getattr(self.request, 'version', None), query_params, *parts)
+
+    def _get_not_modified_response(self, etag, last_modified):
+        if not is_not_modified(self.request, etag=etag, last_modified=last_modified):
+            return None
+
+        # serialization and rendering are skipped
+        response = HttpResponseNotModified()
+        set_validator_headers(response, etag, last_modified)
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        if hasattr(renderer, '_attach_deprecation_warning'):
+            renderer._attach_deprecation_warning(dict(self.get_renderer_context(), response=response))
+        return response
 
     def _get_collection(self):
         qs = self.filter_queryset(self.get_queryset())
-        return self._prepare_filtered_qs(qs=qs), qs
+        collection = self._prepare_filtered_qs(qs=qs)
+        if isinstance(collection, QuerySet):
+            if self.values_serialization and not self.keyset_pagination:
+                collection = self._qs_values(collection)
+            if self.only_requested_fields and getattr(self, '_values_plan', None) is None:
+                collection = self._qs_only_requested_fields(collection)
+        return collection, qs
+
+    def _qs_values(self, qs):
+        plan = get_values_plan(self.get_serializer_class(), qs.model, self.fetching_fields_tree.names)
+        if plan is None:
+            return qs
+
+        self._values_plan = plan
+        # columns of related models are joined by lookups
+        return qs.select_related(None).prefetch_related(None).values_list(*plan.lookups)
+
+    def _qs_only_requested_fields(self, qs):
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, BaseSerializer) or qs.query.select_related is True:
+            return qs
+
+        paths = serializer_class.get_requested_model_fields(self.fetching_fields_tree or None)
+        if paths is None:
+            return qs
+
+        return qs.only(*get_only_fields(qs.model, paths, qs.query.select_related or {}))
+
+    def _serialize_collection(self, collection):
+        plan = getattr(self, '_values_plan', None)
+        if plan is None:
+            if self.cache_fragments:
+                return self._serialize_collection_fragments(collection)
+            return super(BaseReadView, self)._serialize_collection(collection)
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return serialize_values(plan, serializer.fields, collection)
+
+    def _serialize_collection_fragments(self, collection):
+        """Serializes only items which have no cached fragments (fragments are fetched by one `get_many`)"""
+        items = list(collection)
+        serializer_class = self.get_serializer_class()
+        # fragments of camelized responses are cached camelized, so they're not camelized by every response
+        camelized = isinstance(getattr(self.request, 'accepted_renderer', None), JsonRenderer)
+
+        prefix = get_fragments_prefix(
+            '{}.{}'.format(serializer_class.__module__, serializer_class.__name__),
+            sorted(self.fetching_fields_external),
+            getattr(self.request, 'version', None),
+            camelized,
+        )
+        keys = [get_fragment_key(prefix, item.pk, getattr(item, self.fragment_version_field)) for item in items]
+
+        def serialize(missing_items):
+            data = super(BaseReadView, self)._serialize_collection(missing_items)
+            if camelized:
+                return [Camelized(camelize(item)) for item in data]
+            return [dict(item) for item in data]
+
+        return serialize_with_fragments(items, keys, serialize, timeout=self.fragment_cache_timeout)
 
     def _get_paginator(self):
         from functools import partial
@@ -164,57 +467,302 @@ class BaseReadView(BaseView):
         pagination_validator = self.pagination_validator_class(data={'page': page, 'offset': offset, 'limit': limit})
         pagination_validator.is_valid(raise_exception=True)
 
-        return partial(OffsetPaginator, limit=limit, offset=offset, page=page)
+        if self.keyset_pagination:
+            return partial(self._get_keyset_paginator, limit=limit,
+                           cursor=self.request.query_params.get(self.cursor_kwarg))
 
-    def _prepare_paginated_response(self, paginator, total_items_count):
-        response = Response(data=self._prepare_response(paginator.get_frame()))
-        response.extra = dict(
-            meta=camelize(self.pagination_meta_format(
+        return partial(OffsetPaginator, limit=limit, offset=offset, page=page, detect_next=self.detect_next_page)
+
+    def _get_keyset_paginator(self, collection, limit, cursor):
+        try:
+            return KeysetPaginator(collection=collection, limit=limit, cursor=cursor)
+        except InvalidCursorError:
+            raise ApiValidationError({self.cursor_kwarg: [
+                pack_validation_message(_('Invalid cursor.'), Codes.ValidationAliases.INVALID)
+            ]})
+        except InvalidOrderingError:
+            raise ApiValidationError({api_settings.ORDERING_PARAM: [
+                pack_validation_message(_('Ordering by nullable fields isn\'t supported.'),
+                                        Codes.ValidationAliases.INVALID)
+            ]})
+
+    def _get_pagination_meta(self, paginator, total_items_count):
+        if isinstance(paginator, KeysetPaginator):
+            meta = self.cursor_pagination_meta_format(
+                count_items=total_items_count,
+                limit=(paginator.limit
+                       if paginator.limit is not None
+                       else next(iter(paginator.ALL_ITEMS_FLAGS), None)),
+                cursor=paginator.cursor,
+                next_cursor=paginator.next_cursor)
+        else:
+            meta = self.pagination_meta_format(
                 count_items=total_items_count,
                 limit=(paginator.end - paginator.start
                        if paginator.end is not None
                        else next(iter(paginator.ALL_ITEMS_FLAGS), None)),
-                offset=paginator.start)))
+                offset=paginator.start)
+
+        if self.return_total_number:
+            meta['count_strategy'] = self.count_strategy.name
+
+        if self.detect_next_page:
+            meta['has_next'] = paginator.has_next
+            meta['has_previous'] = paginator.has_previous
+
+        return camelize(meta)
+
+    def _prepare_paginated_response(self, paginator, total_items_count):
+        response = Response(data=self._prepare_response(paginator.get_frame()))
+        response.extra = dict(meta=self._get_pagination_meta(paginator, total_items_count))
+        return response
+
+    def _serialize_collection_chunks(self, collection):
+        """Serializes collection by chunks of `stream_chunk_size` items"""
+        if isinstance(collection, QuerySet):
+            chunks = self._iter_queryset_chunks(collection)
+        else:
+            items = iter(collection)
+            chunks = iter(lambda: list(islice(items, self.stream_chunk_size)), [])
+
+        for chunk in chunks:
+            yield self._serialize_collection(chunk)
+
+    def _iter_queryset_chunks(self, queryset):
+        """Fetches primary keys of the queryset, then each chunk of items by its own query (`pk__in`)
+
+        `iterator()` isn't used, because most database drivers (e.g. psycopg2 without named cursors)
+        load the whole result set into memory anyway.
+        """
+        pks = list(queryset.values_list('pk', flat=True))
+
+        base = queryset._clone()
+        base.query.clear_limits()
+        for start in range(0, len(pks), self.stream_chunk_size):
+            # ordering of the queryset is kept within the chunk
+            yield list(base.filter(pk__in=pks[start:start + self.stream_chunk_size]))
+
+    def _prepare_streaming_response(self, paginator, total_items_count):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        if not hasattr(renderer, 'render_stream'):
+            # e.g. browsable api
+            return self._prepare_paginated_response(paginator=paginator, total_items_count=total_items_count)
+
+        response = StreamingHttpResponse(
+            content_type='{}; charset={}'.format(renderer.media_type, renderer.charset))
+        response.streaming_content = renderer.render_stream(
+            chunks=self._serialize_collection_chunks(paginator.get_frame()),
+            meta=self._get_pagination_meta(paginator, total_items_count),
+            renderer_context=dict(self.get_renderer_context(), response=response))
         return response
 
     def list(self, request, *args, **kwargs):
+        cached = self._get_cached_response()
+        if cached is not None:
+            return cached
+
         paginator = self._get_paginator()
         collection, all_items = self._get_collection()
+
+        etag, last_modified = self.get_collection_validators(all_items)
+        not_modified = self._get_not_modified_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
         paginator = paginator(collection=collection)
 
         total_items_count = None
         if all_items is not None and self.return_total_number:
-            if hasattr(all_items, 'count'):
-                total_items_count = all_items.count()
-            else:
-                total_items_count = len(all_items)
+            total_items_count = self.count_strategy.count(all_items)
+
+        if self.stream_collection:
+            response = self._prepare_streaming_response(
+                paginator=paginator, total_items_count=total_items_count)
+        else:
+            response = self._prepare_paginated_response(
+                paginator=paginator, total_items_count=total_items_count)
+
+        set_validator_headers(response, etag, last_modified)
+        return self._cache_response(response)
 
-        return self._prepare_paginated_response(
-            paginator=paginator, total_items_count=total_items_count)
+
+def _check_bulk_validator(validator, model, method):
+    """Raises if the validator saves items its own way (custom `create`/`update`, many-to-many and nested fields)"""
+    if getattr(type(validator), method) not in (
+            getattr(serializers.Serializer, method), getattr(serializers.ModelSerializer, method)):
+        raise ImproperlyConfigured('{} overrides `{}`, so it can\'t be used by `bulk_{}`.'.format(
+            type(validator).__name__, method, method))
+
+    opts = model._meta
+    for name, field in validator.fields.items():
+        if field.read_only:
+            continue
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            model_field = None
+        if (isinstance(field, (serializers.BaseSerializer, ManyRelatedField)) or
+                model_field is not None and (model_field.many_to_many or model_field.one_to_many)):
+            raise ImproperlyConfigured(
+                '{}.{} is a many-to-many or nested field, so {} can\'t be used by `bulk_{}`.'.format(
+                    type(validator).__name__, name, type(validator).__name__, method))
 
 
 class CreationViewMixin(object):
+    allow_bulk_create = False  # `create` saves a list of items by `bulk_create` (see `check_bulk_create`)
+    bulk_create_batch_size = 100
+
     def perform_create(self, validator):
         return validator.save()
 
+    def perform_bulk_create(self, validator):
+        model = self.get_queryset().model
+        objs = [model(**item) for item in validator.validated_data]
+        return bulk_insert(model, objs, batch_size=self.bulk_create_batch_size)
+
+    def check_bulk_create(self, validator):
+        """Items are saved as `model(**validated_data)`, so validators which save items their own way
+        (custom `create`, many-to-many and nested fields) can't be used in bulk mode
+        """
+        _check_bulk_validator(validator.child, self.get_queryset().model, 'create')
+
+    def bulk_create(self, request, *args, **kwargs):
+        validator = self.get_validator(data=request.data, many=True)
+        self.check_bulk_create(validator)
+        if not validator.is_valid():
+            raise ApiValidationError(self._get_bulk_errors(validator.errors))
+
+        with transaction.atomic():
+            objs = self.perform_bulk_create(validator)
+
+        if self.cache_objects:
+            object_cache.invalidate_model_objects(self.get_queryset().model)  # e.g. cached not found objects
+        self.invalidate_response_cache()
+        return Response(data=self._serialize_obj(objs, many=True), status=status.HTTP_201_CREATED)
+
     def create(self, request, *args, **kwargs):
+        if self.allow_bulk_create and isinstance(request.data, list):
+            return self.bulk_create(request, *args, **kwargs)
+
         validator = self.get_validator(data=request.data)
         validator.is_valid(raise_exception=True)
         obj = self.perform_create(validator)
+        self.invalidate_response_cache()
         data = self._serialize_obj(obj)
         return Response(data=data, status=status.HTTP_201_CREATED)
 
 
 class UpdateViewMixin(object):
+    # `PATCH` of the collection updates items `[{id, ...changes}]`, `id` is the value of `lookup_field`
+    # (changes are saved by `bulk_update`, see `check_bulk_update`)
+    allow_update_collection = False
+    bulk_update_id_field = 'id'
+    bulk_update_batch_size = 100
+
     def perform_update(self, validator):
         return validator.save()
 
+    def perform_bulk_update(self, validators):
+        """Saves changes grouped by the set of changed fields (one `UPDATE` per group and batch)"""
+        groups = {}
+        for validator in validators:
+            instance = validator.instance
+            for attr, value in validator.validated_data.items():
+                setattr(instance, attr, value)
+            groups.setdefault(tuple(sorted(validator.validated_data)), []).append(instance)
+
+        for fields, instances in groups.items():
+            if fields:
+                bulk_update(instances, fields, batch_size=self.bulk_update_batch_size)
+
+        return [validator.instance for validator in validators]
+
+    def check_bulk_update(self, validator):
+        """Changes are saved by `setattr` and `bulk_update`, so validators which save items their own way
+        (custom `update`, many-to-many and nested fields) can't be used in bulk mode
+        """
+        _check_bulk_validator(validator, self.get_queryset().model, 'update')
+
+    def _get_bulk_update_ids(self, model, items):
+        """Converts ids of items by the lookup model field (malformed ids would fail the `__in` query)
+
+        :return: (list of ids, None for missing ones; errors of malformed ids by item index)
+        """
+        try:
+            model_field = model._meta.pk if self.lookup_field == 'pk' else model._meta.get_field(self.lookup_field)
+        except FieldDoesNotExist:
+            model_field = None  # lookups through relations aren't converted
+
+        ids, errors = [], {}
+        for index, item in enumerate(items):
+            item_id = item.get(self.bulk_update_id_field) if isinstance(item, dict) else None
+            if item_id is not None and model_field is not None:
+                try:
+                    item_id = model_field.to_python(item_id)
+                except (DjangoValidationError, TypeError, ValueError):
+                    errors[str(index)] = {self.bulk_update_id_field: [
+                        pack_validation_message(_('Invalid value.'), Codes.ValidationAliases.INVALID)
+                    ]}
+                    item_id = None
+            ids.append(item_id)
+        return ids, errors
+
+    def bulk_partial_update(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            raise ApiValidationError({'non_field_errors': [
+                pack_validation_message(_('Expected a list of items.'), Codes.ValidationAliases.NOT_A_LIST)
+            ]})
+
+        self.check_bulk_update(self.get_validator(partial=True))
+        queryset = self.filter_queryset(self.get_queryset())
+        ids, errors = self._get_bulk_update_ids(queryset.model, items)
+        # all targets are loaded by one query
+        instances = {
+            object_cache.normalize_lookup_value(getattr(obj, self.lookup_field)): obj
+            for obj in queryset.filter(**{self.lookup_field + '__in': [i for i in ids if i is not None]})
+        }
+
+        validators = []
+        for index, (item, item_id) in enumerate(zip(items, ids)):
+            if str(index) in errors:
+                continue
+            instance = instances.get(object_cache.normalize_lookup_value(item_id) if item_id is not None else None)
+            if instance is None:
+                errors[str(index)] = {self.bulk_update_id_field: [
+                    pack_validation_message(_('Not found.'), Codes.ValidationAliases.INVALID)
+                ]}
+                continue
+
+            self.check_object_permissions(request, instance)
+            changes = {key: value for key, value in item.items() if key != self.bulk_update_id_field}
+            validator = self.get_validator(instance, data=changes, partial=True)
+            if validator.is_valid():
+                validators.append(validator)
+            else:
+                errors[str(index)] = validator.errors
+
+        if errors:
+            raise ApiValidationError(errors)
+
+        with transaction.atomic():
+            objs = self.perform_bulk_update(validators)
+
+        if self.cache_objects:
+            object_cache.invalidate_model_objects(queryset.model)  # save signals aren't sent
+        self.invalidate_response_cache()
+        return Response(self._serialize_obj(objs, many=True), status=status.HTTP_200_OK)
+
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
+        if partial and self.allow_update_collection and self.lookup_field not in self.kwargs:
+            return self.bulk_partial_update(request, *args, **kwargs)
+
         instance = self.get_object()
         validator = self.get_validator(instance, data=request.data, partial=partial)
         validator.is_valid(raise_exception=True)
         obj = self.perform_update(validator)
+        self.invalidate_response_cache()
         return Response(self._serialize_obj(obj), status=status.HTTP_200_OK)
 
     def partial_update(self, request, *args, **kwargs):
@@ -230,6 +778,10 @@ class UpdateViewMixin(object):
 
 class DestroyViewMixin(object):
     allow_destroy_collection = False
+    # 'single' (one `DELETE`), 'chunked' (by batches of primary keys) or 'background' (see `BackgroundDestroyViewMixin`)
+    destroy_collection_strategy = 'single'
+    destroy_batch_size = 500
+    destroy_batch_pause = 0  # seconds between batches
 
     def destroy(self, request, *args, **kwargs):
         resp = None
@@ -237,12 +789,15 @@ class DestroyViewMixin(object):
             if self.allow_destroy_collection:
                 qs = self.filter_queryset(self.get_queryset())
                 resp = self.perform_destroy_collection(queryset=qs)
+                self._invalidate_destroyed_collection(qs.model)
             else:
                 raise MethodNotAllowed('DELETE')
         else:
             instance = self.get_object()
             resp = self.perform_destroy(instance)
 
+        self.invalidate_response_cache()
+
         if isinstance(resp, Response):
             return resp
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -251,23 +806,84 @@ class DestroyViewMixin(object):
         instance.delete()
 
     def perform_destroy_collection(self, queryset):
-        queryset.delete()
+        if self.destroy_collection_strategy == 'chunked':
+            delete_in_chunks(queryset, batch_size=self.destroy_batch_size, pause=self.destroy_batch_pause)
+        elif self.destroy_collection_strategy == 'background':
+            if not isinstance(self, BackgroundDestroyViewMixin):
+                raise ImproperlyConfigured(
+                    '{} has to use BackgroundDestroyViewMixin for the background destroy strategy '
+                    '(it provides the `delete_job` endpoint).'.format(self.__class__.__name__))
+            job = start_delete_job(
+                queryset, owner=self._get_delete_job_owner(),
+                batch_size=self.destroy_batch_size, pause=self.destroy_batch_pause,
+                on_done=partial(self._invalidate_destroyed_collection, queryset.model))
+            return Response(data=self._serialize_delete_job(job), status=status.HTTP_202_ACCEPTED)
+        else:
+            queryset.delete()
+
+    def _invalidate_destroyed_collection(self, model):
+        if self.cache_objects:
+            object_cache.invalidate_model_objects(model)
+        self.invalidate_response_cache()
 
     def delete(self, request, *args, **kwargs):
         return self.destroy(request, *args, **kwargs)
 
 
+class BackgroundDestroyViewMixin(DestroyViewMixin):
+    """Collection is deleted in a worker thread, `DELETE` responds 202 with the job,
+    its progress is available by the `delete-jobs/<job id>` route
+    """
+    allow_destroy_collection = True
+    destroy_collection_strategy = 'background'
+
+    def _get_delete_job_owner(self):
+        user = self.request.user
+        return '{}.{}'.format(self.__class__.__module__, self.__class__.__name__), getattr(user, 'pk', None)
+
+    def _serialize_delete_job(self, job):
+        return {key: job[key] for key in ('id', 'status', 'total', 'deleted', 'error')}
+
+    # `url_path` is formatted by the router, so the regex has no `{}` quantifiers
+    @list_route(methods=['get'], url_path=r'delete-jobs/(?P<job_id>[0-9a-f]+)')
+    def delete_job(self, request, job_id=None, *args, **kwargs):
+        """Status of background collection delete"""
+        job = get_job(job_id)
+        if job is None or job['owner'] != self._get_delete_job_owner():
+            raise Http404
+        return Response(data=self._serialize_delete_job(job))
+
+
 #
 # View Mixins
 class CommonFetchMixin(object):
     select_related = ()
     prefetch_related = ()
+    auto_fetch_related = False  # infer `select_related`/`prefetch_related` from serializer and requested fields
+    # options of inferred prefetches
+    only_prefetched_fields = False  # fetch only fields of prefetched objects which are read by nested serializers
+    prefetch_limits = {}  # max number of prefetched objects per parent {lookup: limit} (reverse foreign keys only)
 
     def is_fetchable_field(self, field_name):
         fields = self.fetching_fields
         return bool(fields and field_name in fields) or not fields
 
+    def _qs_auto_fetch_related(self, qs):
+        plan = get_fetch_plan(self.get_serializer_class(), qs.model, self.fetching_fields_external)
+
+        if plan.select_related:
+            qs = qs.select_related(*plan.select_related)
+
+        if plan.prefetch_related:
+            qs = qs.prefetch_related(*build_prefetches(
+                plan, only=self.only_prefetched_fields, limits=self.prefetch_limits))
+
+        return qs
+
     def _qs_fetch_related(self, qs):
+        if self.auto_fetch_related:
+            return self._qs_auto_fetch_related(qs)
+
         if not self.select_related and not self.prefetch_related:
             return qs
 
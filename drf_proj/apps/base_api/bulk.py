@@ -0,0 +1,61 @@
+"""Bulk writes which aren't provided by the ORM"""
+from django.db import connections, router, transaction
+from django.db.models import AutoField, Case, Value, When
+
+
+def bulk_insert(model, objs, batch_size=None):
+    """`bulk_create` which sets primary keys generated by the database on all backends (save signals aren't sent)
+
+    Backends which can't return ids of multi-row inserts (e.g. sqlite, mysql) insert objects one by one.
+
+    :return: list of inserted objects
+    """
+    db = router.db_for_write(model)
+    manager = model._default_manager.db_manager(db)
+    if (connections[db].features.can_return_ids_from_bulk_insert or
+            not model._meta.has_auto_field or model._meta.parents):
+        return manager.bulk_create(objs, batch_size=batch_size)
+
+    fields = model._meta.concrete_fields
+    fields_without_pk = [f for f in fields if not isinstance(f, AutoField)]
+    queryset = manager.all()
+    with transaction.atomic(using=db, savepoint=False):
+        for obj in objs:
+            if obj.pk is None:
+                obj.pk = queryset._insert([obj], fields=fields_without_pk, return_id=True)
+            else:
+                queryset._insert([obj], fields=fields)
+    return objs
+
+
+def bulk_update(objs, fields, batch_size=None):
+    """Saves `fields` of `objs` by one `UPDATE ... SET f = CASE WHEN pk = .. THEN .. END WHERE pk IN (..)`
+    per batch (save signals aren't sent)
+
+    `auto_now` fields are updated as well.
+
+    :param fields: names of model fields
+    :return: number of updated rows
+    """
+    if not objs:
+        return 0
+
+    model = objs[0]._meta.concrete_model
+    fields = [model._meta.get_field(name) for name in fields]
+    fields.extend(f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) and f not in fields)
+
+    batch_size = batch_size or len(objs)
+    updated = 0
+
+    for start in range(0, len(objs), batch_size):
+        batch = objs[start:start + batch_size]
+        updates = {}
+        for field in fields:
+            whens = [
+                When(pk=obj.pk, then=Value(field.pre_save(obj, False), output_field=field))
+                for obj in batch
+            ]
+            updates[field.attname] = Case(*whens, output_field=field)
+        updated += model._default_manager.filter(pk__in=[obj.pk for obj in batch]).update(**updates)
+
+    return updated
@@ -1,9 +1,11 @@
 """Api codes/errors"""
 
-from django.utils.translation import ugettext_lazy as _
+from django.utils.translation import get_language, ugettext_lazy as _
 
 
 class Code(object):
+    __slots__ = ('code_value', 'code_name', '_message', 'data', '_heads')
+
     unset = object()
 
     def __init__(self, code_value, code_name, message=unset, data=unset):
@@ -11,6 +13,7 @@ class Code(object):
         self.code_name = code_name
         self._message = message
         self.data = data
+        self._heads = {}  # {language: (code, status, msg)}
 
     def __call__(self, code_value=None, code_name=None, message=None, data=None):
         kwargs = {
@@ -25,6 +28,18 @@ class Code(object):
     def message(self):
         return str(self._message) if self._message is not self.unset else self._message
 
+    @property
+    def head(self):
+        """Serialized (code, status, msg) values for current language"""
+        language = get_language()
+        try:
+            return self._heads[language]
+        except KeyError:
+            message = self.message
+            head = self._heads[language] = (self.code_value, self.code_name,
+                                            message if message is not self.unset else None)
+            return head
+
 
 class Codes(object):
     # Success
@@ -44,6 +59,7 @@ class Codes(object):
     BAD_REQUEST = Code(1101, 'BadRequest')
     NOT_FOUND = Code(1104, 'NotFound')
     METHOD_NOT_ALLOWED = Code(1105, 'MethodNotAllowed')
+    REQUEST_ENTITY_TOO_LARGE = Code(1113, 'RequestEntityTooLarge')
 
     # Client errors
     AUTHENTICATION_ERROR = Code(1200, 'AuthenticationError')
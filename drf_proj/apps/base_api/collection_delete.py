@@ -0,0 +1,129 @@
+"""Chunked and background deletion of collections (see `DestroyViewMixin.destroy_collection_strategy`)"""
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_KEY_PREFIX = 'api:delete-job:'
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def get_cache():
+    return caches[settings.API_DELETE_JOBS_CACHE_ALIAS]
+
+
+def delete_in_chunks(queryset, batch_size, pause=0, progress=None):
+    """Deletes items by batches of primary keys, each batch (with its cascades) is deleted in its own transaction
+
+    So locks are held for one batch only, and only one batch of objects is loaded to resolve cascades.
+
+    :param pause: seconds between batches
+    :param progress: function `(number of deleted items)` called after each batch
+    :return: number of deleted items (cascades aren't counted)
+    """
+    model = queryset.model
+    queryset = queryset.order_by('pk')
+    deleted, last_pk = 0, None
+
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(batch.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+
+        with transaction.atomic(using=queryset.db):
+            model._base_manager.using(queryset.db).filter(pk__in=pks).delete()
+
+        deleted += len(pks)
+        last_pk = pks[-1]
+        if progress is not None:
+            progress(deleted)
+
+        if len(pks) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return deleted
+
+
+def get_job(job_id):
+    """:return: job dict {id, owner, status, total, deleted, error} or None"""
+    return get_cache().get(JOB_KEY_PREFIX + job_id)
+
+
+def _save_job(job):
+    get_cache().set(JOB_KEY_PREFIX + job['id'], dict(job), settings.API_DELETE_JOBS_TIMEOUT)
+
+
+def start_delete_job(queryset, owner, batch_size, pause=0, on_done=None):
+    """Runs `delete_in_chunks` in a worker thread, progress is stored in the cache (see `get_job`)
+
+    :param owner: hashable identity of the job owner (only the owner can read the job status)
+    :param on_done: function called by the worker after all items are deleted
+    :return: job dict
+    """
+    job = {
+        'id': uuid.uuid4().hex,
+        'owner': owner,
+        'status': PENDING,
+        'total': queryset.count(),
+        'deleted': 0,
+        'error': None,
+    }
+    _save_job(job)
+
+    worker = threading.Thread(
+        target=_run_delete_job, args=(job, queryset, batch_size, pause, on_done),
+        name='api-delete-job-{}'.format(job['id']))
+    worker.daemon = True
+    try:
+        worker.start()
+    except Exception as e:
+        _fail_job(job, e)
+        raise
+    return job
+
+
+def _fail_job(job, error):
+    job['status'] = FAILED
+    job['error'] = str(error) or error.__class__.__name__
+    _save_job(job)
+
+
+def _run_delete_job(job, queryset, batch_size, pause, on_done):
+    def progress(deleted):
+        job['deleted'] = deleted
+        _save_job(job)
+
+    try:
+        job['status'] = RUNNING
+        _save_job(job)
+        delete_in_chunks(queryset, batch_size=batch_size, pause=pause, progress=progress)
+        if on_done is not None:
+            on_done()
+        job['status'] = DONE
+        _save_job(job)
+    except BaseException as e:
+        # any failure of the worker (including `SystemExit`, failed progress saves) has to finish the job
+        logger.exception('Delete job %s failed', job['id'])
+        try:
+            _fail_job(job, e)
+        except Exception:
+            logger.exception('Cannot save failed delete job %s', job['id'])
+    finally:
+        # the worker thread has its own database connections
+        for connection in connections.all():
+            connection.close()
@@ -0,0 +1,53 @@
+"""Conditional GET (`ETag`/`Last-Modified` validators of api responses)"""
+import calendar
+import datetime
+import hashlib
+
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+
+
+def make_etag(*parts):
+    """Strong entity tag of `parts` (their `repr`s have to be stable)"""
+    return '"{}"'.format(hashlib.md5(repr(parts).encode('utf-8')).hexdigest())
+
+
+def to_timestamp(last_modified):
+    return calendar.timegm(last_modified.utctimetuple())
+
+
+def is_not_modified(request, etag=None, last_modified=None):
+    """Checks `If-None-Match` (has the priority) and `If-Modified-Since` headers of the request
+
+    :param etag: quoted entity tag (see `make_etag`)
+    :param last_modified: datetime
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        # weak comparison (RFC 7232, 3.2)
+        return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE') or '')
+    if if_modified_since is not None and last_modified is not None:
+        return to_timestamp(last_modified) <= if_modified_since
+
+    return False
+
+
+def set_validator_headers(response, etag=None, last_modified=None):
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(to_timestamp(last_modified))
+
+
+def get_validator_headers(response):
+    """:return: (etag, last modified datetime) of the response headers (e.g. of a cached response)"""
+    etag = response.get('ETag')
+    last_modified = parse_http_date_safe(response.get('Last-Modified') or '')
+    if last_modified is not None:
+        last_modified = datetime.datetime.fromtimestamp(last_modified, tz=timezone.utc)
+    return etag, last_modified
@@ -0,0 +1,135 @@
+"""Strategies of counting total number of items for `BaseReadView.return_total_number`"""
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.db import connections, DatabaseError
+from django.db.models import QuerySet
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExactCount(object):
+    name = 'exact'
+
+    def count(self, collection):
+        if hasattr(collection, 'count'):
+            return collection.count()
+        return len(collection)
+
+
+class NoCount(ExactCount):
+    name = 'none'
+
+    def count(self, collection):
+        return None
+
+
+class EstimatedCount(ExactCount):
+    """Uses the query planner estimation (postgres).
+
+    Unfiltered tables are estimated by `pg_class.reltuples`, other queries by `EXPLAIN` row estimate.
+    Sqlite stand-in: `sqlite_stat1` row number of unfiltered tables (available after `ANALYZE`).
+    Exact count is used if there's no estimation.
+    """
+    name = 'estimated'
+
+    def count(self, collection):
+        if not isinstance(collection, QuerySet):
+            return super(EstimatedCount, self).count(collection)
+
+        vendor = connections[collection.db].vendor
+        estimate = None
+
+        try:
+            if vendor == 'postgresql':
+                estimate = self._postgresql_estimate(collection)
+            elif vendor == 'sqlite':
+                estimate = self._sqlite_estimate(collection)
+        except DatabaseError as e:
+            logger.warning('Cannot estimate number of items: %s', e)
+
+        if estimate is None:
+            return super(EstimatedCount, self).count(collection)
+        return estimate
+
+    def _is_plain_table(self, queryset):
+        query = queryset.query
+        return not query.where and not query.distinct and query.low_mark == 0 and query.high_mark is None
+
+    def _postgresql_estimate(self, queryset):
+        with connections[queryset.db].cursor() as cursor:
+            if self._is_plain_table(queryset):
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                               [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+                # tables which were never analyzed have `-1`
+                if row and row[0] >= 0:
+                    return row[0]
+
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+
+    def _sqlite_estimate(self, queryset):
+        if not self._is_plain_table(queryset):
+            return None
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if not cursor.fetchone():
+                return None
+
+            # the table row (`idx IS NULL`) exists for tables without indexes only, the first integer
+            # of index rows is the number of rows of the index (partial indexes have fewer rows)
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [queryset.model._meta.db_table])
+            counts = [int(row[0].split()[0]) for row in cursor.fetchall() if row[0]]
+            return max(counts) if counts else None
+
+
+class CachedCount(ExactCount):
+    """Caches number of items for `timeout` seconds, the cache key is a hash of normalized queryset sql"""
+    name = 'cached'
+
+    def __init__(self, timeout=60, counter=None, key_prefix='api:count:'):
+        self.timeout = timeout
+        self.counter = counter or ExactCount()
+        self.key_prefix = key_prefix
+
+    def get_cache_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        normalized = '{}|{}|{!r}'.format(queryset.db, ' '.join(sql.split()), params)
+        return self.key_prefix + hashlib.md5(normalized.encode('utf-8')).hexdigest()
+
+    def count(self, collection):
+        if not isinstance(collection, QuerySet):
+            return self.counter.count(collection)
+
+        key = self.get_cache_key(collection)
+        total = cache.get(key)
+        if total is None:
+            total = self.counter.count(collection)
+            cache.set(key, total, self.timeout)
+        return total
+
+
+class ThresholdCount(ExactCount):
+    """Stops counting after `threshold` items, reports `">{threshold}"` in that case"""
+    name = 'threshold'
+
+    def __init__(self, threshold=1000):
+        self.threshold = threshold
+
+    def count(self, collection):
+        if not isinstance(collection, QuerySet):
+            return super(ThresholdCount, self).count(collection)
+
+        total = collection.order_by()[:self.threshold + 1].count()
+        if total > self.threshold:
+            return '>{}'.format(self.threshold)
+        return total
@@ -12,6 +12,11 @@ class TemporarilyUnavailable(ApiError):
     default_detail = _('Service is temporarily unavailable, please try later.')
 
 
+class RequestEntityTooLarge(ApiError):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = _('Request body is too large.')
+
+
 class ConflictState(ApiError):
     status_code = status.HTTP_409_CONFLICT
     default_detail = _('Conflict state.')
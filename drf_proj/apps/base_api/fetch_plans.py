@@ -0,0 +1,276 @@
+"""`select_related`/`prefetch_related` plans inferred from serializers"""
+from collections import namedtuple, OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import connections
+from django.db.models import Model, Prefetch, QuerySet
+from rest_framework import serializers
+
+from .fetching_fields import FieldsTree
+from .serializers import BaseSerializer
+
+
+FetchPlan = namedtuple('FetchPlan', 'select_related prefetch_related')
+# `only`: projection of prefetched objects (None - all fields),
+# `fk_name`: foreign key of prefetched objects to the parent object (reverse foreign key relations only)
+PrefetchPlan = namedtuple('PrefetchPlan', 'lookup model select_related only fk_name')
+
+
+@lru_cache(maxsize=settings.API_FETCH_PLANS_CACHE_SIZE)
+def get_fetch_plan(serializer_class, model, requested_fields):
+    """Builds minimal fetch plan for relations which are represented by nested serializers
+
+    Single relations (FK, one-to-one) are joined by `select_related`, many relations are prefetched
+    (single relations of prefetched objects are joined in prefetch querysets).
+
+    :param requested_fields: external fetching fields of the view (all fields if empty)
+    :return: `FetchPlan`
+    """
+    select_related = set()
+    prefetch_related = OrderedDict()  # {lookup: PrefetchPlan}
+
+    _collect_relations(
+        serializer_class=serializer_class,
+        model=model,
+        fields_tree=FieldsTree.from_fields(requested_fields) if requested_fields else None,
+        path=(),
+        prefetch_lookup=None,
+        select_related=select_related,
+        prefetch_related=prefetch_related,
+    )
+
+    prefetch_plans = []
+    for plan in prefetch_related.values():
+        plan = plan._replace(select_related=_minimal_paths(plan.select_related))
+        if plan.only is not None:
+            only = get_only_fields(plan.model, plan.only, _paths_to_tree(plan.select_related))
+            if plan.fk_name:
+                only.add(plan.fk_name)  # is used to match prefetched objects with parents
+            plan = plan._replace(only=tuple(sorted(only)))
+        prefetch_plans.append(plan)
+
+    return FetchPlan(select_related=_minimal_paths(select_related), prefetch_related=tuple(prefetch_plans))
+
+
+def _collect_relations(serializer_class, model, fields_tree, path, prefetch_lookup,
+                       select_related, prefetch_related):
+    for name, decl in serializer_class._declared_fields.items():
+        if fields_tree and name not in fields_tree.names:
+            continue
+
+        nested = decl.child if isinstance(decl, serializers.ListSerializer) else decl
+        if not isinstance(nested, BaseSerializer):
+            continue
+
+        nested_fields_tree = fields_tree.get((name,)) if fields_tree else None
+        source = decl.source or name
+        related_model, related_path, related_prefetch_lookup = model, path, prefetch_lookup
+        attrs = [] if source == '*' else source.split('.')
+
+        for i, attr in enumerate(attrs):
+            field = _get_attribute_field(related_model, attr)
+            if field is None:
+                break  # property, method, etc.
+            if not field.is_relation or field.related_model is None:
+                break  # e.g. generic foreign key
+
+            related_path += (attr,)
+            lookup = '__'.join(related_path)
+
+            if field.many_to_many or field.one_to_many:
+                related_prefetch_lookup = lookup
+                is_represented = i == len(attrs) - 1  # the nested serializer represents prefetched objects
+                prefetch_related.setdefault(lookup, PrefetchPlan(
+                    lookup=lookup,
+                    model=field.related_model,
+                    select_related=set(),
+                    only=(nested.__class__.get_requested_model_fields(nested_fields_tree)
+                          if is_represented else None),
+                    fk_name=field.field.name if field.one_to_many and field.auto_created else None,
+                ))
+            elif related_prefetch_lookup is not None:
+                prefetch_related[related_prefetch_lookup].select_related.add(
+                    lookup[len(related_prefetch_lookup) + 2:])
+            else:
+                select_related.add(lookup)
+
+            related_model = field.related_model
+        else:
+            _collect_relations(
+                serializer_class=nested.__class__,
+                model=related_model,
+                fields_tree=nested_fields_tree,
+                path=related_path,
+                prefetch_lookup=related_prefetch_lookup,
+                select_related=select_related,
+                prefetch_related=prefetch_related,
+            )
+
+
+def _get_attribute_field(model, attr):
+    """Model field or reverse relation which is accessed by the model attribute (e.g. `<model>_set` accessor)"""
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        field = None
+    if field is not None and not (field.auto_created and not field.concrete):
+        return field
+
+    # reverse relations are named by related query names, attributes are accessor names
+    return next((rel for rel in model._meta.related_objects if rel.get_accessor_name() == attr), None)
+
+
+def _minimal_paths(paths):
+    """Excludes paths which are implied by longer ones (e.g. `a` by `a__b`)"""
+    return tuple(sorted(p for p in paths if not any(o.startswith(p + '__') for o in paths)))
+
+
+def _paths_to_tree(paths):
+    """e.g. ('a__b', 'c') -> {'a': {'b': {}}, 'c': {}} (the format of `Query.select_related`)"""
+    tree = {}
+    for path in paths:
+        node = tree
+        for name in path.split('__'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def get_only_fields(model, paths, select_related):
+    """Converts attribute paths to `only()` fields; attributes which are not concrete model fields are skipped
+
+    :param paths: `__` separated attribute paths (see `BaseSerializer.get_requested_model_fields`)
+    :param select_related: `Query.select_related` tree of the queryset
+    :return: set of fields
+    """
+    only_fields = set()
+
+    for path in paths:
+        current_model, related, field_path = model, select_related, []
+
+        for name in path.split('__'):
+            try:
+                field = current_model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # e.g. `<fk>_id` attribute
+                field = next((f for f in current_model._meta.concrete_fields if f.attname == name), None)
+            if field is None:
+                break  # property, method, etc.
+            if not field.concrete:
+                break  # reverse relations and many-to-many fields are fetched separately
+
+            field_path.append(name)
+            only_fields.add('__'.join(field_path))
+
+            if not field.is_relation or name not in related:
+                break
+            current_model, related = field.related_model, related[name]
+
+    # relations fetched by `select_related` can't be deferred
+    stack = [('', select_related)]
+    while stack:
+        prefix, related = stack.pop()
+        for name, sub_related in related.items():
+            only_fields.add(prefix + name)
+            stack.append((prefix + name + '__', sub_related))
+
+    return only_fields
+
+
+class PerParentLimitQuerySet(QuerySet):
+    """Ranks objects of the parents the queryset is filtered by (`<fk_name>__in`, as prefetching does)"""
+    per_parent_limit = None  # (fk_name, limit)
+
+    def _clone(self, **kwargs):
+        kwargs.setdefault('per_parent_limit', self.per_parent_limit)
+        return super(PerParentLimitQuerySet, self)._clone(**kwargs)
+
+    def filter(self, *args, **kwargs):
+        clone = super(PerParentLimitQuerySet, self).filter(*args, **kwargs)
+        if self.per_parent_limit is not None:
+            fk_name, limit = self.per_parent_limit
+            parents = kwargs.get(fk_name + '__in')
+            if parents:
+                clone = _rank_per_parent(clone, fk_name, limit, parents)._clone(per_parent_limit=None)
+        return clone
+
+
+def _rank_per_parent(queryset, fk_name, limit, parents):
+    opts = queryset.model._meta
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+    inner, ranked = qn('api_limited'), qn('api_ranked')
+    fk = opts.get_field(fk_name)
+
+    order_by = []
+    for f in list(queryset.query.order_by or opts.ordering) + ['pk']:
+        if not isinstance(f, str):
+            continue  # expressions are not supported
+        name = f.lstrip('-')
+        try:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            continue  # e.g. ordering by related model fields
+        column = '{}.{} {}'.format(inner, qn(field.column), 'DESC' if f.startswith('-') else 'ASC')
+        if column not in order_by:
+            order_by.append(column)
+
+    parent_ids = [
+        fk.get_db_prep_value(fk.get_foreign_related_value(p)[0] if isinstance(p, Model) else p, connection)
+        for p in parents
+    ]
+    where = (
+        '{table}.{pk} IN ('
+        'SELECT {ranked}.{pk} FROM ('
+        'SELECT {inner}.{pk}, ROW_NUMBER() OVER (PARTITION BY {inner}.{fk} ORDER BY {order_by}) AS {rn} '
+        'FROM {table} {inner} WHERE {inner}.{fk} IN ({parent_ids})'
+        ') {ranked} WHERE {ranked}.{rn} <= %s)'
+    ).format(
+        table=qn(opts.db_table), pk=qn(opts.pk.column), fk=qn(fk.column),
+        inner=inner, ranked=ranked, rn=qn('api_row_number'), order_by=', '.join(order_by),
+        parent_ids=', '.join(['%s'] * len(parent_ids)),
+    )
+    return queryset.extra(where=[where], params=parent_ids + [limit])
+
+
+def limit_per_parent(queryset, fk_name, limit):
+    """Limits queryset of prefetched objects to the first `limit` objects of each parent
+
+    Objects are ranked by `ROW_NUMBER()` window function over the objects of the same parent, ordering of
+    the queryset is used. The ranking is computed once for the prefetched parents, so the limit is applied
+    when the queryset is filtered by parents (`<fk_name>__in=parents`, as `prefetch_related` does).
+
+    :return: `PerParentLimitQuerySet`
+    """
+    limited = PerParentLimitQuerySet(
+        model=queryset.model, query=queryset.query.clone(), using=queryset._db, hints=queryset._hints)
+    limited._prefetch_related_lookups = queryset._prefetch_related_lookups[:]
+    limited.per_parent_limit = (fk_name, limit)
+    return limited
+
+
+def build_prefetches(plan, only=False, limits=None):
+    """Converts `PrefetchPlan`s to `Prefetch` objects (querysets are not shared between requests)
+
+    :param only: fetch only fields which are read to represent prefetched objects
+    :param limits: max number of prefetched objects per parent {lookup: limit}, reverse foreign key relations only
+    """
+    prefetches = []
+    for prefetch in plan.prefetch_related:
+        queryset = prefetch.model._default_manager.all()
+        if prefetch.select_related:
+            queryset = queryset.select_related(*prefetch.select_related)
+        if only and prefetch.only is not None:
+            queryset = queryset.only(*prefetch.only)
+
+        limit = (limits or {}).get(prefetch.lookup)
+        if limit is not None:
+            if not prefetch.fk_name:
+                raise ImproperlyConfigured(
+                    'Prefetch limit of "{}": only reverse foreign key relations can be limited '
+                    '(many-to-many and generic relations are not supported).'.format(prefetch.lookup))
+            queryset = limit_per_parent(queryset, prefetch.fk_name, limit)
+
+        prefetches.append(Prefetch(prefetch.lookup, queryset=queryset))
+    return prefetches
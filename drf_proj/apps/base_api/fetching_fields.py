@@ -0,0 +1,95 @@
+"""Compiled `fields` query param (sparse fieldsets)"""
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.conf import settings
+
+
+class FieldsTree(object):
+    """Immutable prefix tree of requested fields
+
+    e.g. `a,b__c` -> {a, b: {c}}; `names` are the requested fields of the node,
+    `children` are subtrees of nested fields.
+    """
+    __slots__ = ('names', 'children')
+
+    def __init__(self, names=frozenset(), children=None):
+        self.names = names
+        self.children = MappingProxyType(children or {})
+
+    @classmethod
+    def from_fields(cls, fields):
+        """
+        :param fields: iterable of `__` separated field paths
+        """
+        root = {}
+        for field in fields:
+            node = root
+            for name in field.split('__'):
+                node = node.setdefault(name, {})
+            node[None] = True  # the path was requested itself (not only as a prefix)
+        return cls._from_dict(root)
+
+    @classmethod
+    def _from_dict(cls, node):
+        return cls(
+            names=frozenset(name for name, sub_node in node.items() if name is not None and None in sub_node),
+            children={name: cls._from_dict(sub_node) for name, sub_node in node.items()
+                      if name is not None and any(n is not None for n in sub_node)}
+        )
+
+    def get(self, path):
+        """Returns subtree of nested fields or None"""
+        node = self
+        for name in path:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def __bool__(self):
+        return bool(self.names or self.children)
+
+
+CompiledFetchingFields = namedtuple('CompiledFetchingFields', 'internal external tree')
+
+
+@lru_cache(maxsize=settings.API_FETCHING_FIELDS_CACHE_SIZE)
+def compile_fetching_fields(view_class, requested_fields):
+    """Expands `fields` query param using `fetching_fieldsets` and `fetching_fields_aliases` of the view class
+
+    :param requested_fields: tuple of terms of `fields` query param
+    :return: `CompiledFetchingFields` (`internal` field names with alias targets, requested `external` field names,
+             and `tree` of external names)
+    """
+    fetching_fields = set()
+
+    if requested_fields or view_class.default_fetching_fields:
+        for f in (requested_fields or view_class.default_fetching_fields):
+            f = f.replace('.', '__')
+            fetching_fields.add(f)
+            if '__' in f:
+                p = f.split('__')
+                while p:
+                    fetching_fields.add('__'.join(p))
+                    p = p[:-1]
+
+    if view_class.fetching_fieldsets:
+        for field_set, fields in view_class.fetching_fieldsets.items():
+            if field_set in fetching_fields:
+                fetching_fields.discard(field_set)
+                fetching_fields.update(fields)
+
+    external = frozenset(fetching_fields)
+
+    # replace aliases in `fetching_fields` to use internally
+    if view_class.fetching_fields_aliases:
+        for _alias in fetching_fields.intersection(view_class.fetching_fields_aliases):
+            fetching_fields.add(view_class.fetching_fields_aliases[_alias])
+
+    return CompiledFetchingFields(
+        internal=frozenset(fetching_fields),
+        external=external,
+        tree=FieldsTree.from_fields(external),
+    )
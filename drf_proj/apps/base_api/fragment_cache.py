@@ -0,0 +1,48 @@
+"""Cache of serialized collection items (fragments)
+
+Fragment key includes the item version (e.g. `updated_at`), so changed items are serialized again
+and stale fragments expire by timeout.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+FRAGMENT_KEY_PREFIX = 'api:fragment:'
+
+
+def get_cache():
+    return caches[settings.API_FRAGMENT_CACHE_ALIAS]
+
+
+def _hash(value):
+    return hashlib.md5(repr(value).encode('utf-8')).hexdigest()
+
+
+def get_fragments_prefix(*parts):
+    """Prefix of fragment keys of the same representation (serializer, requested fields, api version, etc.)"""
+    return '{}{}:'.format(FRAGMENT_KEY_PREFIX, _hash(parts))
+
+
+def get_fragment_key(prefix, pk, version):
+    return prefix + _hash((pk, version))
+
+
+def serialize_with_fragments(items, keys, serialize, timeout):
+    """Serializes items which have no cached fragments
+
+    :param keys: fragment keys of `items`
+    :param serialize: function `(list of items) -> list of representations`
+    :return: list of representations of `items`
+    """
+    cache = get_cache()
+    fragments = cache.get_many(keys)
+
+    missing = [(item, key) for item, key in zip(items, keys) if key not in fragments]
+    if missing:
+        serialized = dict(zip((key for item, key in missing), serialize([item for item, key in missing])))
+        cache.set_many(serialized, timeout)
+        fragments.update(serialized)
+
+    return [fragments[key] for key in keys]
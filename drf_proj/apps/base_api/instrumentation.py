@@ -0,0 +1,130 @@
+"""Sql queries instrumentation of api views"""
+from collections import OrderedDict
+from functools import partial
+import re
+import sys
+from time import time
+
+from django.db import connections
+from django.db.backends.utils import CursorWrapper
+from rest_framework.fields import Field
+
+
+class QueryBudgetExceeded(AssertionError):
+    """View made more sql queries than its `query_budget` allows"""
+
+
+re_placeholders_list = re.compile(r'%s(\s*,\s*%s)+')
+re_transaction_statement = re.compile(r'\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+
+
+def get_query_shape(sql):
+    """The same sql with different params has the same shape (e.g. `IN (%s, %s)` -> `IN (%s...)`)"""
+    return re_placeholders_list.sub('%s...', sql)
+
+
+def find_serializer_field():
+    """Finds the innermost serializer field in the call stack (e.g. the one which triggered a lazy query)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        obj = frame.f_locals.get('self')
+        if isinstance(obj, Field) and obj.field_name:
+            return '{}.{}'.format(obj.parent.__class__.__name__, obj.field_name)
+        frame = frame.f_back
+    return None
+
+
+class QueryShape(object):
+    __slots__ = ('sql', 'count', 'duration', 'trigger')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.duration = 0.
+        self.trigger = None
+
+
+class InstrumentedCursorWrapper(CursorWrapper):
+    """Times queries of the wrapped cursor (the debug cursor if queries of the connection are logged)"""
+    def __init__(self, cursor, db, collector):
+        super(InstrumentedCursorWrapper, self).__init__(cursor, db)
+        self.collector = collector
+
+    def execute(self, sql, params=None):
+        start = time()
+        try:
+            return super(InstrumentedCursorWrapper, self).execute(sql, params)
+        finally:
+            self.collector.add(sql, time() - start)
+
+    def executemany(self, sql, param_list):
+        start = time()
+        try:
+            return super(InstrumentedCursorWrapper, self).executemany(sql, param_list)
+        finally:
+            self.collector.add(sql, time() - start)
+
+
+class QueryCollector(object):
+    """Collects sql queries of all database connections of the current thread
+
+        with QueryCollector() as queries:
+            ...
+        queries.count, queries.duration, queries.repeated(threshold=3)
+    """
+    def __init__(self):
+        self.shapes = OrderedDict()  # {sql shape: QueryShape}
+        self.count = 0
+        self.duration = 0.
+        self._patched_connections = []
+
+    def __enter__(self):
+        for connection in connections.all():
+            # connections are thread local, so patching of the instance affects the current thread only
+            self._patched_connections.append(
+                (connection, connection.force_debug_cursor, connection.__dict__.get('make_debug_cursor')))
+            # `connection.queries` (e.g. `assertNumQueries`) are logged by the previous debug cursor
+            make_cursor = partial(
+                self._make_cursor, connection,
+                connection.make_debug_cursor if connection.queries_logged else None)
+            connection.force_debug_cursor = True
+            connection.make_debug_cursor = make_cursor
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for connection, force_debug_cursor, make_debug_cursor in self._patched_connections:
+            connection.force_debug_cursor = force_debug_cursor
+            if make_debug_cursor is None:
+                del connection.make_debug_cursor
+            else:
+                connection.make_debug_cursor = make_debug_cursor  # nested collector
+        self._patched_connections = []
+
+    def _make_cursor(self, connection, make_debug_cursor, cursor):
+        if make_debug_cursor is not None:
+            cursor = make_debug_cursor(cursor)
+        return InstrumentedCursorWrapper(cursor, db=connection, collector=self)
+
+    def add(self, sql, duration):
+        shape = get_query_shape(sql)
+        query = self.shapes.get(shape)
+        if query is None:
+            query = self.shapes[shape] = QueryShape(shape)
+
+        query.count += 1
+        query.duration += duration
+        self.count += 1
+        self.duration += duration
+
+        if query.count == 2:
+            # looking through the stack only once per repeated query
+            query.trigger = find_serializer_field()
+
+    def repeated(self, threshold):
+        """Queries of the same shape which were made at least `threshold` times (N+1 candidates),
+        transaction statements (`BEGIN`, `SAVEPOINT`, etc.) aren't reported
+        """
+        return [
+            query for query in self.shapes.values()
+            if query.count >= threshold and not re_transaction_statement.match(query.sql)
+        ]
@@ -0,0 +1,126 @@
+"""Json encoding backends for api renderers
+
+Each backend produces the same output as `rest_framework.renderers.JSONRenderer` does in compact mode:
+values the json library can't handle natively (datetime, UUID, Decimal, lazy translations, etc.)
+are converted by the renderer's `encoder_class`, outputs which the library formats differently
+(e.g. `1e-7` instead of `1e-07`) are encoded with stdlib json.
+"""
+from functools import lru_cache
+from importlib import import_module
+import json
+import re
+
+
+class StdlibJsonBackend(object):
+    name = 'json'
+
+    def __init__(self, encoder_class, ensure_ascii, separators):
+        self.encoder_class = encoder_class
+        self.ensure_ascii = ensure_ascii
+        self.separators = separators
+
+    @classmethod
+    def supports(cls, ensure_ascii, separators):
+        return True
+
+    def dumps(self, data):
+        ret = json.dumps(data, cls=self.encoder_class, ensure_ascii=self.ensure_ascii, separators=self.separators)
+        # `\u2028` and `\u2029` are valid json, but not valid javascript
+        ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode('utf-8')
+
+
+class ThirdPartyJsonBackend(StdlibJsonBackend):
+    # Values which can't be encoded by the library (e.g. non-str keys, too big integers)
+    # are encoded with stdlib json
+    fallback_errors = (TypeError, ValueError, OverflowError)
+    # output of the library which differs from stdlib json output (false positives, e.g. in strings,
+    # are encoded with stdlib json as well)
+    divergent_output = None
+
+    def __init__(self, encoder_class, ensure_ascii, separators):
+        super(ThirdPartyJsonBackend, self).__init__(encoder_class, ensure_ascii, separators)
+        self.lib = import_module(self.name)
+        self.default = encoder_class().default
+
+    @classmethod
+    def supports(cls, ensure_ascii, separators):
+        # third party libraries produce compact output only
+        return separators == (',', ':')
+
+    def dumps(self, data):
+        try:
+            ret = self._dumps(data)
+        except self.fallback_errors:
+            return super(ThirdPartyJsonBackend, self).dumps(data)
+
+        if isinstance(ret, str):
+            ret = ret.encode('utf-8')
+        if self.divergent_output is not None and self.divergent_output.search(ret):
+            return super(ThirdPartyJsonBackend, self).dumps(data)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def _dumps(self, data):
+        raise NotImplementedError
+
+
+class OrjsonBackend(ThirdPartyJsonBackend):
+    """NOTE: unlike stdlib json, orjson encodes NaN/Infinity as `null` (it can't be detected by the output)"""
+    name = 'orjson'
+    divergent_output = re.compile(rb'[0-9]e|0\.0000')  # `1e16`, `1e-7`, `0.00001`
+
+    @classmethod
+    def supports(cls, ensure_ascii, separators):
+        # orjson always produces utf-8
+        return not ensure_ascii and super(OrjsonBackend, cls).supports(ensure_ascii, separators)
+
+    def _dumps(self, data):
+        # datetime objects are passed to `default` in order to keep the format of `encoder_class`
+        return self.lib.dumps(data, default=self.default, option=self.lib.OPT_PASSTHROUGH_DATETIME)
+
+
+class UjsonBackend(ThirdPartyJsonBackend):
+    name = 'ujson'
+    divergent_output = re.compile(rb'[0-9]e-[0-9](?![0-9])|(?:^|[\[:,])-?Inf\b')  # `1e-7`, `Inf`
+
+    def _dumps(self, data):
+        return self.lib.dumps(data, default=self.default, ensure_ascii=self.ensure_ascii,
+                              escape_forward_slashes=False)
+
+
+class RapidjsonBackend(ThirdPartyJsonBackend):
+    name = 'rapidjson'
+    divergent_output = re.compile(rb'\\u[0-9A-F]{0,3}[A-F]')  # control characters are escaped in upper case
+
+    @classmethod
+    def supports(cls, ensure_ascii, separators):
+        # rapidjson escapes non-ascii characters in upper case (e.g. `\u00E9`)
+        return not ensure_ascii and super(RapidjsonBackend, cls).supports(ensure_ascii, separators)
+
+    def _dumps(self, data):
+        # datetime, UUID and Decimal objects are passed to `default` by default
+        return self.lib.dumps(data, default=self.default, ensure_ascii=False)
+
+
+json_backends = {
+    backend.name: backend
+    for backend in (StdlibJsonBackend, OrjsonBackend, UjsonBackend, RapidjsonBackend)
+}
+
+
+@lru_cache(maxsize=None)
+def get_json_backend(names, encoder_class, ensure_ascii, separators):
+    """Returns the first installed backend of `names` which supports requested output format
+
+    :param names: backend names in order of preference (see `json_backends`)
+    """
+    for name in names:
+        backend = json_backends[name]
+        if not backend.supports(ensure_ascii, separators):
+            continue
+        try:
+            return backend(encoder_class, ensure_ascii, separators)
+        except ImportError:
+            continue
+
+    return StdlibJsonBackend(encoder_class, ensure_ascii, separators)
@@ -0,0 +1,39 @@
+"""Compares compiled and generic `to_representation` of `many=True` serializers (see `representation`)"""
+from timeit import repeat
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from drf_proj.apps.client_api.v1.auth.login import UserSerializer
+
+
+class GenericUserSerializer(UserSerializer):
+    compiled_representation = False
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks compiled `to_representation` of a flat read-only serializer against the generic one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='number of serialized objects')
+        parser.add_argument('--repeat', type=int, default=5, help='number of measurements (the best one is shown)')
+
+    def handle(self, *args, **options):
+        # unsaved objects, so only serialization is measured
+        users = [
+            User(id=i, username='user{}'.format(i), email='user{}@example.com'.format(i))
+            for i in range(options['rows'])
+        ]
+
+        generic = GenericUserSerializer(users, many=True).data
+        compiled = UserSerializer(users, many=True).data
+        if [dict(item) for item in generic] != compiled:
+            raise CommandError('Compiled representation differs from the generic one.')
+
+        results = {}
+        for name, serializer_class in (('generic', GenericUserSerializer), ('compiled', UserSerializer)):
+            results[name] = min(repeat(
+                lambda: serializer_class(users, many=True).data, number=1, repeat=options['repeat']))
+            self.stdout.write('{:<10}{:>10.1f}ms'.format(name, results[name] * 1000))
+
+        self.stdout.write('speedup {:.2f}x on {} rows'.format(results['generic'] / results['compiled'], len(users)))
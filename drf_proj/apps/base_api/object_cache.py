@@ -0,0 +1,112 @@
+"""Read-through cache of objects looked up by `get_object` (pk/UUID lookups of safe requests)
+
+Keys are stamped by the model version, which is bumped by bulk changes (e.g. collection delete),
+and by the object version, which is bumped when the object is saved or deleted. Versions are read
+before the object is fetched from the database, so an object fetched before a concurrent change
+is stored under the outdated key. Missing objects are cached as `NOT_FOUND`.
+
+Limits: changes which don't send save/delete signals (`QuerySet.update()`, `bulk_create`, raw sql,
+other services writing to the database) are visible only after `invalidate_model_objects` or
+the cache timeout, so the cache is off by default (see `BaseView.cache_objects`).
+"""
+from collections import defaultdict
+from time import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+
+KEY_PREFIX = 'api:object:'
+STAMP_KEY_PREFIX = 'api:object-stamp:'
+VERSION_KEY_PREFIX = 'api:object-version:'
+NOT_FOUND = 'api:object-not-found'
+
+# {model: lookup fields which are used by views caching objects of the model}
+_lookup_fields = defaultdict(set)
+
+
+def get_cache():
+    return caches[settings.API_OBJECT_CACHE_ALIAS]
+
+
+def normalize_lookup_value(value):
+    """The same UUID in different formats (hex, hyphenated, `UUID`) has the same key"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, str):
+        try:
+            return str(uuid.UUID(value))
+        except ValueError:
+            return value
+    return str(value)
+
+
+def _initial_version():
+    # versions which were evicted from the cache don't start again from the same number
+    return int(time() * 1000)
+
+
+def _get_stamp_key(model):
+    return STAMP_KEY_PREFIX + model._meta.label_lower
+
+
+def _get_version_key(model, lookup_field, value):
+    return '{}{}:{}:{}'.format(VERSION_KEY_PREFIX, model._meta.label_lower, lookup_field, normalize_lookup_value(value))
+
+
+def get_object_key(model, lookup_field, value):
+    """Key of the current versions of the model and of the object (missing versions are initialized)"""
+    cache = get_cache()
+    keys = [_get_stamp_key(model), _get_version_key(model, lookup_field, value)]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # `add` doesn't override a version which was set by a concurrent request
+        for key in missing:
+            cache.add(key, _initial_version(), None)
+        versions.update(cache.get_many(missing))
+
+    return '{}{}:{}:{}:{}:{}'.format(
+        KEY_PREFIX, model._meta.label_lower, versions.get(keys[0], 0), versions.get(keys[1], 0), lookup_field,
+        normalize_lookup_value(value))
+
+
+def get_cached_object(key):
+    """:return: cached object, `NOT_FOUND` or None if it isn't cached"""
+    return get_cache().get(key)
+
+
+def cache_object(key, obj, timeout):
+    """:param obj: object or `NOT_FOUND`"""
+    get_cache().set(key, obj, timeout)
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), None)  # objects weren't looked up by this version yet
+
+
+def invalidate_model_objects(model):
+    """Invalidates all cached objects of the model (e.g. after bulk changes)"""
+    _bump(_get_stamp_key(model))
+
+
+def _invalidate_instance(sender, instance, **kwargs):
+    for lookup_field in _lookup_fields[sender]:
+        _bump(_get_version_key(sender, lookup_field, getattr(instance, lookup_field)))
+
+
+def connect_invalidation(model, lookup_field):
+    """Invalidates cached objects (including not found ones) when instances of the model are saved or deleted"""
+    if lookup_field in _lookup_fields[model]:
+        return
+    _lookup_fields[model].add(lookup_field)
+    dispatch_uid = 'api_object_cache:{}'.format(model._meta.label_lower)
+    post_save.connect(_invalidate_instance, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(_invalidate_instance, sender=model, dispatch_uid=dispatch_uid)
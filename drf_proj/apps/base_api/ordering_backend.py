@@ -20,7 +20,13 @@ class CustomOrderingBackend(OrderingFilter):
         return result_ordering
 
     def get_ordering(self, request, queryset, view):
-        ordering = super(CustomOrderingBackend, self).get_ordering(request, queryset, view)
+        # terms are split and converted to snake_case once per request (see `CamelCaseQueryParams`)
+        fields = request.query_params.get_terms(self.ordering_param)
+        ordering = None
+        if fields:
+            ordering = self.remove_invalid_fields(queryset, list(fields), view)
+        if not ordering:
+            ordering = self.get_default_ordering(view)
         if not ordering:
             return None
         return ordering
@@ -1,3 +1,14 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q
+
+
 class PaginatorError(Exception):
     """Base paginator exception"""
 
@@ -14,17 +25,60 @@ class InvalidLimitError(PaginatorError):
     """Incorrect `limit` parameter"""
 
 
-class OffsetPaginator(object):
+class InvalidCursorError(PaginatorError):
+    """Incorrect `cursor` parameter"""
+
+
+class InvalidOrderingError(PaginatorError):
+    """Ordering of the collection isn't supported by the paginator"""
+
+
+class BasePaginator(object):
     ALL_ITEMS_FLAGS = (-1, 'all', '-1')
     ALL_ITEMS_LIMIT_VALUE = None
 
-    DEFAULT_OFFSET = 0
     DEFAULT_LIMIT = 10
-    DEFAULT_PAGE = 0
 
     NOT_SET = object()
 
-    def __init__(self, collection, limit=DEFAULT_LIMIT, **params):
+    def to_number(self, val, *default):
+        if self._is_num(val):
+            return val
+
+        if self._is_str(val) and val.lstrip('-').isdigit():
+            return int(val)
+
+        if default:
+            return default[0]
+        return None
+
+    def _is_num(self, value):
+        return isinstance(value, int)
+
+    def _is_str(self, value):
+        return isinstance(value, str)
+
+    def validate_limit(self, limit):
+        if limit in self.ALL_ITEMS_FLAGS:
+            return self.ALL_ITEMS_LIMIT_VALUE
+
+        if limit is None or limit is self.NOT_SET:
+            return self.DEFAULT_LIMIT
+
+        limit = self.to_number(limit)
+        if isinstance(limit, int) and limit >= 0:
+            return limit
+        raise InvalidLimitError()
+
+    def get_frame(self):
+        raise NotImplementedError
+
+
+class OffsetPaginator(BasePaginator):
+    DEFAULT_OFFSET = 0
+    DEFAULT_PAGE = 0
+
+    def __init__(self, collection, limit=BasePaginator.DEFAULT_LIMIT, **params):
         """This paginator slices frame of items using offset/limit concept
 
         :param collection: iterable object that contains all items
@@ -33,11 +87,15 @@ class OffsetPaginator(object):
         :param page: if offset is None, the page param can be used to paginate
                      through collection (values None, [0, +inf]); `offset` has a higher
                      priority
+        :param detect_next: if True, one extra item is fetched in order to find out
+                            whether there's a next frame (see `has_next`)
         """
         self._all_items = collection
         self._offset = self.validate_offset(params.get('offset'))
         self._page = self.validate_page(params.get('page'))
         self._limit = self.validate_limit(limit)
+        self._detect_next = params.get('detect_next', False)
+        self._has_next = None
         self._start, self._end = self.DEFAULT_OFFSET, self.DEFAULT_OFFSET + self.DEFAULT_LIMIT
 
         self._init_start_end_edge()
@@ -61,23 +119,6 @@ class OffsetPaginator(object):
         elif not self._is_num(self._offset):
             self._end = self._start + self._limit
 
-    def to_number(self, val, *default):
-        if self._is_num(val):
-            return val
-
-        if self._is_str(val) and val.lstrip('-').isdigit():
-            return int(val)
-
-        if default:
-            return default[0]
-        return None
-
-    def _is_num(self, value):
-        return isinstance(value, int)
-
-    def _is_str(self, value):
-        return isinstance(value, str)
-
     def validate_offset(self, offset):
         offset = self.to_number(offset, self.NOT_SET)
         if self._is_num(offset) and offset >= 0 or offset is self.NOT_SET:
@@ -90,24 +131,21 @@ class OffsetPaginator(object):
             return page
         raise InvalidPageError()
 
-    def validate_limit(self, limit):
-        if limit in self.ALL_ITEMS_FLAGS:
-            return self.ALL_ITEMS_LIMIT_VALUE
-
-        if limit is None or limit is self.NOT_SET:
-            return self.DEFAULT_LIMIT
-
-        limit = self.to_number(limit)
-        if isinstance(limit, int) and limit >= 0:
-            return limit
-        raise InvalidLimitError()
-
     def get_frame(self):
         """Performs slicing of collection
 
         :return: slice of items according to offset/limit/page values
         """
-        return self._all_items[slice(self.start, self.end)]
+        if not self._detect_next:
+            return self._all_items[slice(self.start, self.end)]
+
+        if self.end is None:
+            self._has_next = False
+            return list(self._all_items[slice(self.start, self.end)])
+
+        items = list(self._all_items[slice(self.start, self.end + 1)])
+        self._has_next = len(items) > self.end - self.start
+        return items[:self.end - self.start]
 
     @property
     def start(self):
@@ -116,3 +154,174 @@ class OffsetPaginator(object):
     @property
     def end(self):
         return self._end
+
+    @property
+    def has_next(self):
+        """Available after `get_frame` call in `detect_next` mode"""
+        return self._has_next
+
+    @property
+    def has_previous(self):
+        return self.start > 0
+
+
+class KeysetPaginator(BasePaginator):
+    UNIQUE_ORDERING_FIELD = 'pk'
+
+    def __init__(self, collection, limit=BasePaginator.DEFAULT_LIMIT, cursor=None, **params):
+        """This paginator slices frame of items which follow the item the `cursor` points to
+
+        Ordering of `collection` (e.g. chosen by ordering backend) is used, unique field is added to it
+        in order to get stable ordering. So fetching of any page costs the same as fetching of the first one.
+        Ordering fields have to be non-nullable (`InvalidOrderingError` is raised otherwise).
+
+        :param collection: queryset that contains all items
+        :param limit: count of items to slice (values [0, +inf]); page size
+        :param cursor: opaque token returned as `next_cursor` of the previous frame (None for the first frame)
+        """
+        self._all_items = collection
+        self._limit = self.validate_limit(limit)
+        self._ordering = self._get_ordering(collection)
+        self._ordering_fields = self._get_ordering_fields(collection.model, self._ordering)
+        self._cursor = cursor or None
+        self._cursor_values = self.validate_cursor(self._cursor)
+        self._next_cursor = None
+
+    def _get_ordering(self, collection):
+        ordering = list(collection.query.order_by or collection.query.get_meta().ordering)
+        pk_names = {self.UNIQUE_ORDERING_FIELD, collection.model._meta.pk.name}
+
+        if not any(isinstance(f, str) and f.lstrip('-') in pk_names for f in ordering):
+            direction = '-' if ordering and str(ordering[-1]).startswith('-') else ''
+            ordering.append(direction + self.UNIQUE_ORDERING_FIELD)
+
+        if not all(isinstance(f, str) and f.lstrip('-') != '?' for f in ordering):
+            raise PaginatorError('Keyset pagination supports ordering by fields only.')
+
+        return ordering
+
+    def _get_ordering_fields(self, model, ordering):
+        """:return: model fields of the ordering (None for annotations)"""
+        fields = []
+        for name in ordering:
+            opts, field, nullable = model._meta, None, False
+            for attr in name.lstrip('-').split('__'):
+                if opts is None:
+                    field = None
+                    break
+                try:
+                    field = opts.pk if attr == 'pk' else opts.get_field(attr)
+                except FieldDoesNotExist:
+                    field = None
+                    break
+                # `(f > v)` doesn't match NULL, so items with NULL would be skipped or fetched again
+                nullable = nullable or field.null or field.one_to_many or field.many_to_many
+                opts = field.related_model._meta if field.is_relation else None
+
+            if nullable:
+                raise InvalidOrderingError('Keyset pagination doesn\'t support ordering by nullable field {}.'.format(
+                    name.lstrip('-')))
+            fields.append(field)
+        return fields
+
+    def encode_cursor(self, values):
+        payload = json.dumps([self._ordering, values], default=_cursor_value_default, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def validate_cursor(self, cursor):
+        if cursor is None:
+            return None
+
+        try:
+            ordering, values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, binascii.Error):
+            raise InvalidCursorError()
+
+        # the cursor was issued for another ordering
+        if ordering != self._ordering or not isinstance(values, list) or len(values) != len(ordering):
+            raise InvalidCursorError()
+
+        # values are converted as the query would do it, so tampered values don't fail the query
+        converted = []
+        for field, value in zip(self._ordering_fields, values):
+            if value is None or isinstance(value, (list, dict)):
+                raise InvalidCursorError()
+            if field is not None:
+                try:
+                    value = field.to_python(value)
+                except (ValidationError, TypeError, ValueError):
+                    raise InvalidCursorError()
+            converted.append(value)
+        return converted
+
+    def _get_cursor_filter(self, values):
+        # (f1 > v1) | (f1 = v1 & f2 > v2) | ... (`<` for descending fields)
+        cursor_filter = Q()
+        equal_to = {}
+
+        for field, value in zip(self._ordering, values):
+            name = field.lstrip('-')
+            lookup = '{}__{}'.format(name, 'lt' if field.startswith('-') else 'gt')
+            cursor_filter |= Q(**dict(equal_to, **{lookup: value}))
+            equal_to[name] = value
+
+        return cursor_filter
+
+    def _get_item_values(self, item):
+        values = []
+        for field in self._ordering:
+            value = item
+            for attr in field.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            values.append(value.pk if isinstance(value, Model) else value)
+        return values
+
+    def get_frame(self):
+        """Fetches `limit` items following the cursor (one extra item is fetched to detect next frame)
+
+        :return: list of items
+        """
+        qs = self._all_items.order_by(*self._ordering)
+        if self._cursor_values is not None:
+            qs = qs.filter(self._get_cursor_filter(self._cursor_values))
+
+        if self._limit is self.ALL_ITEMS_LIMIT_VALUE:
+            return list(qs)
+
+        items = list(qs[:self._limit + 1])
+        if len(items) > self._limit:
+            items = items[:self._limit]
+            if items:
+                self._next_cursor = self.encode_cursor(self._get_item_values(items[-1]))
+
+        return items
+
+    @property
+    def limit(self):
+        return self._limit
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    @property
+    def next_cursor(self):
+        """Available after `get_frame` call"""
+        return self._next_cursor
+
+    @property
+    def has_next(self):
+        """Available after `get_frame` call"""
+        return self._next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self._cursor is not None
+
+
+def _cursor_value_default(o):
+    if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+        return o.isoformat()  # keeps microseconds
+    if isinstance(o, (uuid.UUID, decimal.Decimal)):
+        return str(o)
+    raise TypeError('Cannot be encoded to cursor: %r' % o)
@@ -1,6 +1,109 @@
-from djangorestframework_camel_case.util import underscoreize, camel_to_underscore
+from functools import lru_cache
+import json
+
+from django.conf import settings
+from django.http.request import QueryDict
+from django.utils.translation import ugettext_lazy as _
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
 from rest_framework.settings import api_settings
 
+from .exceptions import RequestEntityTooLarge
+
+
+@lru_cache(maxsize=settings.API_QUERY_PARAMS_CACHE_SIZE)
+def underscore(value):
+    """Memoized camelCase -> snake_case conversion of query param keys and values"""
+    return camel_to_underscore(value)
+
+
+class CamelCaseQueryParams(QueryDict):
+    """Read-only `QueryDict` with snake_case keys of camelCase query params
+
+    The original query dict is converted on the first read, values of `parsing_values` params are converted as well.
+    """
+    def __init__(self, query_dict, parsing_values=()):
+        super(CamelCaseQueryParams, self).__init__(encoding=query_dict.encoding)
+        self._query_dict = query_dict
+        self._parsing_values = parsing_values
+        self._materialized = False
+        self._terms = {}  # {key: tuple of comma separated terms}
+
+    def _materialize(self):
+        if self._materialized:
+            return
+        self._materialized = True
+        for key, values in self._query_dict.lists():
+            key = underscore(key)
+            if dict.__contains__(self, key):
+                continue  # the first of camelCase/snake_case variants of the key wins
+            if key in self._parsing_values:
+                values = [underscore(v) if isinstance(v, str) else v for v in values]
+            dict.__setitem__(self, key, list(values))
+
+    def get_terms(self, key):
+        """Comma separated terms of the param value (e.g. `fields`, ordering) without empty ones
+
+        :return: tuple of stripped terms
+        """
+        terms = self._terms.get(key)
+        if terms is None:
+            value = self.get(key)
+            terms = self._terms[key] = tuple(
+                term for term in (t.strip() for t in (value or '').split(',')) if term)
+        return terms
+
+    def __getitem__(self, key):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__getitem__(key)
+
+    def getlist(self, key, default=None):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).getlist(key, default)
+
+    def __contains__(self, key):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__contains__(key)
+
+    def __iter__(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__iter__()
+
+    def __len__(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__len__()
+
+    def __repr__(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__repr__()
+
+    def keys(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).keys()
+
+    def _iterlists(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self)._iterlists()
+
+    lists = _iterlists
+
+    def __getstate__(self):
+        self._materialize()
+        return super(CamelCaseQueryParams, self).__getstate__()
+
+    def __copy__(self):
+        """:return: mutable `QueryDict` with converted keys and values"""
+        query_dict = QueryDict(mutable=True, encoding=self.encoding)
+        for key, values in self.lists():
+            query_dict.setlist(key, values)
+        return query_dict
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    copy = __copy__
+
 
 class CamelCaseQueryStringParser(object):
     parsing_values = (
@@ -10,14 +113,91 @@ class CamelCaseQueryStringParser(object):
 
     @classmethod
     def parse(cls, request):
-        from django.http.request import QueryDict
-        tmp = QueryDict('', mutable=True)
-        data = underscoreize(dict(request.GET))
-        for k, v in data.items():
-            if k in cls.parsing_values:
-                if isinstance(v, str):
-                    v = camel_to_underscore(v)
-                elif isinstance(v, list):
-                    v = [(camel_to_underscore(v_) if isinstance(v_, str) else v_) for v_ in v]
-            tmp.setlistdefault(k, v)
-        return tmp
+        return CamelCaseQueryParams(request.GET, parsing_values=cls.parsing_values)
+
+
+class BodyLimits(object):
+    """`object_pairs_hook` which renames keys to snake_case and checks nesting depth and array length
+
+    Objects are decoded bottom-up, so the depth of an object is known when the hook is called for it
+    and limits are checked before the enclosing structures are decoded.
+    """
+    def __init__(self, max_depth, max_array_length):
+        self.max_depth = max_depth
+        self.max_array_length = max_array_length
+        self.depths = {}  # {id(decoded object): depth}
+
+    def object_pairs_hook(self, pairs):
+        obj = {}
+        depth = 1
+        for key, value in pairs:
+            obj[underscore(key)] = value
+            if isinstance(value, (dict, list)):
+                depth = max(depth, self.get_depth(value) + 1)
+
+        self.check_depth(depth)
+        self.depths[id(obj)] = depth
+        return obj
+
+    def get_depth(self, value):
+        if isinstance(value, dict):
+            return self.depths[id(value)]
+
+        if len(value) > self.max_array_length:
+            raise RequestEntityTooLarge(_('Arrays of the request body are limited to {} items.').format(
+                self.max_array_length))
+
+        depth = 1
+        for item in value:
+            if isinstance(item, (dict, list)):
+                depth = max(depth, self.get_depth(item) + 1)
+
+        self.check_depth(depth)
+        return depth
+
+    def check_depth(self, depth):
+        if depth > self.max_depth:
+            raise self.depth_error()
+
+    def depth_error(self):
+        return RequestEntityTooLarge(_('Nesting depth of the request body is limited to {}.').format(self.max_depth))
+
+
+class CamelCaseJSONParser(JSONParser):
+    """Decodes JSON body and renames camelCase keys to snake_case in the same pass
+
+    Body size (checked before the body is read), nesting depth and array length are limited.
+    """
+    max_body_size = settings.API_MAX_BODY_SIZE
+    max_depth = settings.API_MAX_BODY_DEPTH
+    max_array_length = settings.API_MAX_BODY_ARRAY_LENGTH
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        request = parser_context.get('request')
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0) if request is not None else 0
+        except ValueError:
+            content_length = 0
+
+        if content_length > self.max_body_size:
+            raise RequestEntityTooLarge()
+
+        body = stream.read(self.max_body_size + 1)
+        if len(body) > self.max_body_size:
+            raise RequestEntityTooLarge()
+
+        limits = BodyLimits(max_depth=self.max_depth, max_array_length=self.max_array_length)
+        try:
+            data = json.loads(body.decode(encoding), object_pairs_hook=limits.object_pairs_hook)
+            if isinstance(data, list):
+                limits.get_depth(data)
+        except RecursionError:
+            # the decoder recurses into nested arrays/objects before the hook is called for them
+            raise limits.depth_error()
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+        return data
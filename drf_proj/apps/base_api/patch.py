@@ -1,13 +1,17 @@
-import base64
-import marshal
+import logging
 
+from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.query_utils import DeferredAttribute
 from rest_framework import request, fields
 from rest_framework.exceptions import ValidationError
 
 from .parsers import CamelCaseQueryStringParser
 
 
+logger = logging.getLogger(__name__)
+
+
 # Patching rest_framework Request in order to allow querystring params camelcase conversion
 @property
 def query_params(self):
@@ -25,16 +29,28 @@ def patch_request():
 
 
 # Patching rest_framework Field, in order to intercept validation code for handling proper response output
+class ValidationMessage(str):
+    """
+    Validation message which carries validation code, case and extra data
+
+    It's a `str`, so it passes through `ValidationError.detail` unchanged.
+    """
+    def __new__(cls, message, code=None, case=None, data=None):
+        obj = super(ValidationMessage, cls).__new__(cls, message)
+        obj.code = code
+        obj.case = case
+        obj.data = data
+        return obj
+
+
 def pack_validation_message(message, code, case=None, data=None):
-    return base64.b64encode(marshal.dumps((str(message), code, case, data)))
+    return ValidationMessage(str(message), code, case, data)
 
 
 def unpack_validation_message(packed_message):
-    try:
-        msg, code, case, data = marshal.loads(base64.b64decode(packed_message))
-        return code, case, msg, data
-    except (TypeError, base64.binascii.Error):
-        return None, None, packed_message, None
+    if isinstance(packed_message, ValidationMessage):
+        return packed_message.code, packed_message.case, str(packed_message), packed_message.data
+    return None, None, packed_message, None
 
 
 def field_fail(self, key, **kwargs):
@@ -65,9 +81,9 @@ def field_run_validators(self, value):
                 raise
 
             if isinstance(exc.detail, str):
-                exc.detail = pack_validation_message(exc.detail,
-                                                     getattr(validator, 'code', None),
-                                                     getattr(exc, 'case', None))
+                exc.detail = [pack_validation_message(exc.detail,
+                                                      getattr(validator, 'code', None),
+                                                      getattr(exc, 'case', None))]
 
             errors.extend(exc.detail)
         except DjangoValidationError as exc:
@@ -81,3 +97,21 @@ def patch_base_field():
     fields.Field.fail = field_fail
     fields.Field.patched_run_validators = fields.Field.run_validators
     fields.Field.run_validators = field_run_validators
+
+
+# Patching django DeferredAttribute, in order to log lazy loading of deferred fields (each one is an extra query)
+def deferred_attribute_get(self, instance, cls=None):
+    """
+    Logs loading of deferred field value from the database
+    """
+    if instance is not None and self.field_name not in instance.__dict__:
+        logger.warning('Deferred field %s.%s is loaded by an extra query',
+                       instance.__class__.__name__, self.field_name, stack_info=settings.DEBUG)
+    return self.patched_get(instance, cls)
+
+
+def patch_deferred_attribute():
+    if not settings.API_LOG_DEFERRED_FIELDS_LOADING:
+        return
+    DeferredAttribute.patched_get = DeferredAttribute.__get__
+    DeferredAttribute.__get__ = deferred_attribute_get
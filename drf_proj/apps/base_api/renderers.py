@@ -1,3 +1,4 @@
+from functools import lru_cache
 import logging
 import os
 import re
@@ -7,12 +8,15 @@ from django.conf import settings
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
 from django.http import Http404
 from django.utils.encoding import smart_text
+from django.utils.translation import get_language
 from rest_framework import exceptions, status
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS
 from rest_framework.renderers import JSONRenderer as _JSONRenderer
 from rest_framework.response import Response
 from rest_framework.utils import formatting
 
 from .codes import Codes, Code
+from .json_backends import get_json_backend
 from .patch import unpack_validation_message
 
 
@@ -50,17 +54,86 @@ def exception_proxy_handler(exc, ctx):
     return Response(data=exc, status=status_code, headers=headers)
 
 
+# {(renderer class, exception class, message, language): encoded response}
+_fixed_response_bodies = {}
+
+
 class CustomJSONRenderer(_JSONRenderer):
     """
     Renderer which serializes to structured response {msg: .., status: .., code: .., data: .., meta: ..}
     """
     debug_internal_errors = settings.DEBUG
 
+    # exceptions which always produce the same response for the same message; their bodies are cached
+    fixed_response_exceptions = (
+        exceptions.NotFound, exceptions.MethodNotAllowed, exceptions.NotAuthenticated, Http404,
+    )
+
     def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = self._attach_deprecation_warning(renderer_context)
+        compact_output = self.get_indent(accepted_media_type, renderer_context or {}) is None
+
+        if compact_output and isinstance(data, self.fixed_response_exceptions) and not getattr(response, 'extra', None):
+            return self._render_fixed_response_exception(exc=data)
+
+        # Prepare structured response
+        data = self._transform_response(payload=data, response=response)
+
+        if compact_output:
+            return self._encode(data)
+
+        return super(CustomJSONRenderer, self).render(
+            data=data,
+            accepted_media_type=accepted_media_type,
+            renderer_context=renderer_context
+        )
+
+    def render_stream(self, chunks, meta=None, renderer_context=None):
+        """
+        Renders structured response {code: .., status: .., msg: .., meta: .., data: [..]} piece by piece
+
+        :param chunks: iterable of serialized lists of items; each chunk is encoded and yielded separately,
+                       so only one chunk is kept in memory at a time
+        :return: iterator of bytes
+        """
+        # headers have to be set before the streaming starts
+        self._attach_deprecation_warning(renderer_context)
+
+        head = self._prepare_api_response(data=None, code=Codes.OK, meta=meta)
+        del head['data']
+
+        return self._iter_stream(head=self._encode(head)[:-1] + b',"data":[', chunks=chunks)
+
+    def _iter_stream(self, head, chunks):
+        yield head
+
+        separator = b''
+        for chunk in chunks:
+            body = b','.join(self._encode(item) for item in self._transform_data(chunk))
+            if body:
+                yield separator + body
+                separator = b','
+
+        yield b']}'
+
+    def _render_fixed_response_exception(self, exc):
+        key = (self.__class__, exc.__class__, str(exc), get_language())
+        body = _fixed_response_bodies.get(key)
+
+        if body is None:
+            body = self._encode(self._transform_response(payload=exc))
+            if len(_fixed_response_bodies) < settings.API_FIXED_RESPONSES_CACHE_SIZE:
+                _fixed_response_bodies[key] = body
+
+        return body
+
+    def _attach_deprecation_warning(self, renderer_context):
+        """
+        If request API version is in a pending deprecation state
+        Then attach `Warning` header to `response`
+        """
         response = None
 
-        # If request API version is in a pending deprecation state
-        # Then attach `Warning` header to `response`
         if renderer_context and 'response' in renderer_context:
             response = renderer_context['response']
             request = renderer_context.get('request')
@@ -68,16 +141,17 @@ class CustomJSONRenderer(_JSONRenderer):
                 response['Warning'] = '299 - "Pending Deprecation: maintained until {}"'.format(
                     settings.API_PENDING_DEPRECATION_VERSIONS[request.version]
                 )
-        #
 
-        # Prepare structured response
-        data = self._transform_response(payload=data, response=response)
+        return response
 
-        return super(CustomJSONRenderer, self).render(
-            data=data,
-            accepted_media_type=accepted_media_type,
-            renderer_context=renderer_context
-        )
+    def _encode(self, data):
+        """Encodes a piece of structured response using `settings.API_JSON_ENCODER_BACKENDS`"""
+        return get_json_backend(
+            names=tuple(settings.API_JSON_ENCODER_BACKENDS),
+            encoder_class=self.encoder_class,
+            ensure_ascii=self.ensure_ascii,
+            separators=SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        ).dumps(data)
 
     def _transform_response(self, payload, response=None):
         meta = None
@@ -94,7 +168,7 @@ class CustomJSONRenderer(_JSONRenderer):
             if data is Code.unset:
                 data = None
         else:
-            data = payload
+            data = self._transform_data(payload)
             code = Codes.OK
 
         # prepare response structure
@@ -102,6 +176,10 @@ class CustomJSONRenderer(_JSONRenderer):
 
         return resp
 
+    def _transform_data(self, data):
+        """Hook for transforming resource data while the response structure is being built"""
+        return data
+
     def _prepare_api_response(self, data, code, meta=None):
         """
         Prepares response structure
@@ -123,15 +201,17 @@ class CustomJSONRenderer(_JSONRenderer):
 
         return resp
 
-    def _serialize_code(self, code, case=None, data=None, **extra):
+    def _serialize_code(self, code, case=None, data=None, message=None, **extra):
+        """:param message: overrides the message of `code` (errors are serialized without copies of codes)"""
+        code_value, code_name, code_message = code.head
         serialized_data = {
-            'code': code.code_value,
-            'status': code.code_name,
+            'code': code_value,
+            'status': code_name,
         }
         if code.data is not Code.unset:
             serialized_data['data'] = code.data
 
-        serialized_data['msg'] = code.message if code.message is not Code.unset else None
+        serialized_data['msg'] = str(message) if message else code_message
 
         serialized_data.update(**extra)
 
@@ -190,19 +270,19 @@ class CustomJSONRenderer(_JSONRenderer):
 
                 if hasattr(data, 'items'):
                     for field, validation_errors in self._flatten_validation_errors(data):
-                        field = re_camel_finder.sub(underscore_to_camel, field)
+                        field = camelize_key(field)
 
                         for validation_error in validation_errors:
                             validation_code, subcode, message, custom_data = self._unpack_validation_error(validation_error)
                             errors.append(self._serialize_code(
-                                code=validation_code(message=message, data={'field': field}),
-                                case=subcode, data=custom_data
+                                code=validation_code, message=message, case=subcode,
+                                data=dict({'field': field}, **custom_data) if custom_data else {'field': field}
                             ))
 
                     data = errors
 
                 elif isinstance(data, (list, tuple)):
-                    data = [self._serialize_code(c(message=m), case=sc, data=d) for c, sc, m, d in map(self._unpack_validation_error, data)]
+                    data = [self._serialize_code(c, message=m, case=sc, data=d) for c, sc, m, d in map(self._unpack_validation_error, data)]
 
                 elif data:
                     code = code(message=str(data))
@@ -231,24 +311,36 @@ def underscore_to_camel(match):
     return g[0] + g[2].upper()
 
 
+@lru_cache(maxsize=settings.API_CAMELIZE_CACHE_SIZE)
+def camelize_key(key):
+    """Memoized snake_case -> camelCase conversion of a single key"""
+    return re_camel_finder.sub(underscore_to_camel, key)
+
+
+class Camelized(dict):
+    """Already camelized data (e.g. cached fragments), `camelize` keeps it as is"""
+
+
 def camelize(data):
+    if isinstance(data, Camelized):
+        return data
     if isinstance(data, dict):
         return {
-            (re_camel_finder.sub(underscore_to_camel, key)
-             if isinstance(key, str) else key): camelize(value)
+            (camelize_key(key) if isinstance(key, str) else key): camelize(value)
             for key, value in data.items()
         }
-    if isinstance(data, (list, tuple)):
+    if isinstance(data, list):
         return [camelize(i) for i in data]
+    if isinstance(data, tuple):
+        return tuple(camelize(i) for i in data)
     return data
 
 
 class JsonRenderer(CustomJSONRenderer):
-    """Camelized output"""
+    """Camelized output (resource data is camelized while the response structure is being built)"""
 
-    def render(self, data, accepted_media_type=None, renderer_context=None):
-        return super(JsonRenderer, self).render(
-            camelize(data), accepted_media_type=accepted_media_type, renderer_context=renderer_context)
+    def _transform_data(self, data):
+        return camelize(data)
 
 
 class VendorJsonRenderer(JsonRenderer):
@@ -0,0 +1,87 @@
+"""Compiled `to_representation` of read-only serializers
+
+Generated function reads attributes directly and builds a plain dict. Fields which customize attribute lookup
+(e.g. `SerializerMethodField`, related fields, `source='*'`) are processed the generic way.
+"""
+from functools import lru_cache
+from keyword import iskeyword
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework.fields import Field, SerializerMethodField, SkipField, is_simple_callable
+from rest_framework.relations import ManyRelatedField, PKOnlyObject, RelatedField
+
+
+GENERIC = 'generic'
+DIRECT = 'direct'
+
+
+def _call(value):
+    return value() if is_simple_callable(value) else value
+
+
+def get_field_mode(field):
+    """Direct attribute access is used if the field doesn't customize attribute lookup"""
+    if (isinstance(field, (SerializerMethodField, RelatedField, ManyRelatedField)) or
+            type(field).get_attribute is not Field.get_attribute or
+            field.source == '*' or
+            not all(attr.isidentifier() and not iskeyword(attr) for attr in field.source_attrs)):
+        return GENERIC
+    return DIRECT
+
+
+def get_fields_signature(fields):
+    """Hashable description of readable fields which defines generated code"""
+    return tuple(
+        (field.field_name, tuple(field.source_attrs), get_field_mode(field))
+        for field in fields
+    )
+
+
+@lru_cache(maxsize=settings.API_COMPILED_REPRESENTATIONS_CACHE_SIZE)
+def compile_representation(signature):
+    """Generates `to_representation` function factory for fields described by `signature`
+
+    :return: function `(fields) -> to_representation(instance)`
+    """
+    lines = [
+        'def build(fields):',
+        '    ({}) = fields'.format(''.join('f{}, '.format(i) for i in range(len(signature)))),
+        '    def to_representation(instance):',
+        '        ret = {}',
+    ]
+
+    for i, (field_name, source_attrs, mode) in enumerate(signature):
+        key = repr(field_name)
+
+        if mode == DIRECT:
+            lines.append('        v = instance.{}'.format(source_attrs[0]))
+            lines.append('        if callable(v): v = _call(v)')
+            for attr in source_attrs[1:]:
+                lines.append('        if v is not None:')
+                lines.append('            v = v.{}'.format(attr))
+                lines.append('            if callable(v): v = _call(v)')
+            lines.append('        ret[{}] = None if v is None else f{}.to_representation(v)'.format(key, i))
+        else:
+            lines.extend([
+                '        try:',
+                '            v = f{}.get_attribute(instance)'.format(i),
+                '        except SkipField:',
+                '            pass',
+                '        else:',
+                '            c = v.pk if isinstance(v, PKOnlyObject) else v',
+                '            ret[{}] = None if c is None else f{}.to_representation(v)'.format(key, i),
+            ])
+
+    lines.extend([
+        '        return ret',
+        '    return to_representation',
+    ])
+
+    namespace = {'_call': _call, 'SkipField': SkipField, 'PKOnlyObject': PKOnlyObject}
+    exec(compile('\n'.join(lines), '<compiled representation>', 'exec'), namespace)
+    return namespace['build']
+
+
+# Errors which are handled by the generic `to_representation` (defaults of missing attributes, etc.)
+FALLBACK_ERRORS = (AttributeError, KeyError, ObjectDoesNotExist)
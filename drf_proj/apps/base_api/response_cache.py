@@ -0,0 +1,99 @@
+"""Cache of rendered responses of read views
+
+Cache keys include versions of tags (models backing the view), so changing a model invalidates all responses
+tagged by it at once (works with any cache backend, e.g. locmem/file ones which can't delete by pattern).
+"""
+from collections import Counter
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+
+
+TAG_KEY_PREFIX = 'api:tag:'
+RESPONSE_KEY_PREFIX = 'api:response:'
+
+# headers which are not stored with the response (they describe the request which stored it)
+NOT_CACHED_HEADERS = frozenset(('x-query-count', 'vary'))
+
+# process-wide hit/miss counters {(view name, 'hit'/'miss'): number}
+stats = Counter()
+
+
+def get_cache():
+    return caches[settings.API_RESPONSE_CACHE_ALIAS]
+
+
+def get_model_tag(model):
+    return model._meta.label_lower
+
+
+def get_tags_versions(tags):
+    """:return: list of versions of `tags` (missing versions are initialized)"""
+    cache = get_cache()
+    keys = [TAG_KEY_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+
+    missing = {key: 1 for key in keys if key not in versions}
+    if missing:
+        # `add` doesn't override a version which was set by a concurrent request
+        for key, version in missing.items():
+            cache.add(key, version, None)
+        versions.update(cache.get_many(list(missing)))
+
+    return [versions.get(key, 1) for key in keys]
+
+
+def invalidate_tags(*tags):
+    cache = get_cache()
+    for tag in tags:
+        try:
+            cache.incr(TAG_KEY_PREFIX + tag)
+        except ValueError:
+            pass  # responses tagged by it weren't cached yet
+
+
+def invalidate_models(*models):
+    invalidate_tags(*(get_model_tag(model) for model in models))
+
+
+def _invalidate_sender(sender, **kwargs):
+    invalidate_models(sender)
+
+
+def connect_invalidation(model):
+    """Invalidates responses tagged by the model when its instances are saved or deleted"""
+    dispatch_uid = 'api_response_cache:{}'.format(get_model_tag(model))
+    post_save.connect(_invalidate_sender, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(_invalidate_sender, sender=model, dispatch_uid=dispatch_uid)
+
+
+def make_response_key(parts, tags):
+    payload = repr((parts, list(zip(tags, get_tags_versions(tags)))))
+    return RESPONSE_KEY_PREFIX + hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def get_cached_response(key, view_name):
+    cached = get_cache().get(key)
+    if cached is None:
+        stats[view_name, 'miss'] += 1
+        return None
+
+    stats[view_name, 'hit'] += 1
+    content, status, headers = cached
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def cache_response(key, response, timeout):
+    """Stores response after it's rendered (cached bytes are the renderer output)"""
+    def store(rendered_response):
+        headers = [(header, value) for header, value in rendered_response.items()
+                   if header.lower() not in NOT_CACHED_HEADERS]
+        get_cache().set(key, (rendered_response.content, rendered_response.status_code, headers), timeout)
+
+    response.add_post_render_callback(store)
@@ -1,47 +1,96 @@
 from collections import OrderedDict
+import copy
 import logging
 
 from django.conf import settings
 from rest_framework import serializers
 from rest_framework.serializers import Serializer
 
+from .representation import compile_representation, get_fields_signature, FALLBACK_ERRORS
 
-logger = logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
 
-class BaseSerializer(Serializer):
-    depends_on_extra_object_attrs = ()
 
-    def get_fields(self):
-        if self.parent and self.parent.field_name:
-            self._field_name_prefix = '{}__{}__'.format(self.parent.field_name, self.field_name)
-        elif self.field_name:
-            self._field_name_prefix = self.field_name + '__'
-        else:
-            self._field_name_prefix = ''
+# {(serializer class, field path, requested field names): pruned unbound fields}
+_field_prototypes = {}
 
-        output_fields = frozenset()
 
-        if 'view' in self.context:
-            view = self.context['view']
-            output_fields = getattr(view, 'fetching_fields_external', output_fields)
+def clone_field(field):
+    """Shallow copy of unbound field (children of list fields are copied and bound to the copy)"""
+    clone = copy.copy(field)
+    for attr in ('child', 'child_relation'):
+        child = getattr(field, attr, None)
+        if isinstance(child, serializers.Field):
+            child = clone_field(child)
+            # the child was bound to the prototype (`source=''`), binding expects the initial `source`
+            child.source = None
+            child.bind(field_name='', parent=clone)
+            setattr(clone, attr, child)
+    return clone
 
-        if self._field_name_prefix:
-            output_fields = set(
-                f for f in output_fields
-                if f.startswith(self._field_name_prefix)
-            )
 
-        if output_fields:
-            d = OrderedDict()
-            for name, f in super(BaseSerializer, self).get_fields().items():
-                name_path = self._field_name_prefix + name
-                if name_path in output_fields:
-                    d[name] = f
+class BaseSerializer(Serializer):
+    depends_on_extra_object_attrs = ()
+    compiled_representation = False  # generated `to_representation` (read-only serializers, see `representation`)
+    cache_fields = True  # reuse pruned fields of output serializers instead of deep copying declared ones
+
+    def get_field_path(self):
+        """Names of fields from the root serializer to this one (children of `many=True` fields have no names)"""
+        field_path = []
+        node = self
+        while node is not None:
+            if node.field_name:
+                field_path.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(field_path))
 
-            return d
+    def get_fields(self):
+        field_path = self.get_field_path()
+        output_fields = None
 
-        return super(BaseSerializer, self).get_fields()
+        if 'view' in self.context:
+            tree = getattr(self.context['view'], 'fetching_fields_tree', None)
+            if tree:
+                output_fields = tree.get(field_path)
+
+        names = output_fields.names if output_fields else None
+
+        # fields of input serializers may keep validation state (e.g. `UniqueValidator.set_context`)
+        if not self.cache_fields or hasattr(self.root, 'initial_data'):
+            return self._get_pruned_fields(names)
+
+        key = (self.__class__, field_path, names)
+        prototypes = _field_prototypes.get(key)
+        if prototypes is None:
+            prototypes = self._get_pruned_fields(names)
+            if len(_field_prototypes) < settings.API_FIELD_PROTOTYPES_CACHE_SIZE:
+                _field_prototypes[key] = prototypes
+
+        # prototypes stay unbound, the copies are bound to this serializer
+        return OrderedDict((name, clone_field(f)) for name, f in prototypes.items())
+
+    def _get_pruned_fields(self, names):
+        fields = super(BaseSerializer, self).get_fields()
+        if names:
+            return OrderedDict((name, f) for name, f in fields.items() if name in names)
+        return fields
+
+    def to_representation(self, instance):
+        if not self.compiled_representation:
+            return super(BaseSerializer, self).to_representation(instance)
+
+        # the child of `many=True` serializer is the same instance for all items
+        to_representation = self.__dict__.get('_compiled_to_representation')
+        if to_representation is None:
+            fields = tuple(self._readable_fields)
+            to_representation = compile_representation(get_fields_signature(fields))(fields)
+            self._compiled_to_representation = to_representation
+
+        try:
+            return to_representation(instance)
+        except FALLBACK_ERRORS:
+            return super(BaseSerializer, self).to_representation(instance)
 
     @classmethod
     def get_model_fields(cls):
@@ -49,6 +98,43 @@ class BaseSerializer(Serializer):
         model_fields.extend(cls.depends_on_extra_object_attrs)
         return set(model_fields)
 
+    @classmethod
+    def get_requested_model_fields(cls, fields_tree=None):
+        """Returns `__` separated paths of object attributes which are read to represent requested fields
+
+        :param fields_tree: `FieldsTree` of requested fields (all fields are requested if not set)
+        :return: set of paths or None if any attribute can be read (e.g. `Meta.fields = '__all__'`)
+        """
+        meta = getattr(cls, 'Meta', None)
+        meta_fields = getattr(meta, 'fields', ())
+        if meta_fields == '__all__' or getattr(meta, 'exclude', None):
+            return None
+
+        declared_fields = OrderedDict((name, None) for name in meta_fields)
+        declared_fields.update(cls._declared_fields)
+
+        model_fields = set(cls.depends_on_extra_object_attrs)
+
+        for name, decl in declared_fields.items():
+            if fields_tree and name not in fields_tree.names:
+                continue
+
+            source = getattr(decl, 'source', None) or name
+            if source == '*':
+                continue
+
+            path = source.replace('.', '__')
+            model_fields.add(path)
+
+            nested = decl.child if isinstance(decl, serializers.ListSerializer) else decl
+            if isinstance(nested, BaseSerializer):
+                nested_fields = nested.__class__.get_requested_model_fields(
+                    fields_tree.get((name,)) if fields_tree else None)
+                if nested_fields:
+                    model_fields.update('{}__{}'.format(path, f) for f in nested_fields)
+
+        return model_fields
+
 
 class BaseModelSerializer(BaseSerializer, serializers.ModelSerializer):
     pass
@@ -58,6 +144,7 @@ class PaginationSerializerMixin(object):
     SERIALIZATION_OFFSET_PARAM = settings.PAGINATE_OFFSET_PARAM
     SERIALIZATION_PAGE_PARAM = settings.PAGINATE_PAGE_PARAM
     SERIALIZATION_LIMIT_PARAM = settings.REST_FRAMEWORK.get('PAGINATE_BY_PARAM', 'limit')
+    SERIALIZATION_CURSOR_PARAM = settings.PAGINATE_CURSOR_PARAM
 
     class DummyPaginator(object):
         def __init__(self, object_list):
@@ -127,3 +214,10 @@ class PaginationSerializerMixin(object):
             self.SERIALIZATION_OFFSET_PARAM: offset,
         }
 
+    def cursor_pagination_meta_format(self, cursor, next_cursor, limit, count_items=None):
+        return {
+            'count': count_items,
+            self.SERIALIZATION_LIMIT_PARAM: limit,
+            self.SERIALIZATION_CURSOR_PARAM: cursor,
+            'next_' + self.SERIALIZATION_CURSOR_PARAM: next_cursor,
+        }
@@ -0,0 +1,106 @@
+"""Serialization of `values_list()` rows (model instances are not created)"""
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+from .serializers import BaseSerializer
+
+
+# `fields`: ((field name, needs `to_representation` conversion), ...) in order of `lookups`
+ValuesPlan = namedtuple('ValuesPlan', 'lookups fields')
+
+# {serializer field class: model fields whose python values are returned by its `to_representation` as is},
+# values of other pairs (and of subclasses with custom `to_representation`) are converted
+IDENTITY_FIELDS = {
+    serializers.ReadOnlyField: (models.Field,),
+    serializers.IntegerField: (models.IntegerField, models.AutoField),
+    serializers.FloatField: (models.FloatField,),
+    serializers.BooleanField: (models.BooleanField,),
+    serializers.NullBooleanField: (models.BooleanField, models.NullBooleanField),
+    serializers.CharField: (models.CharField, models.TextField),
+    serializers.EmailField: (models.CharField, models.TextField),
+    serializers.SlugField: (models.CharField, models.TextField),
+    serializers.URLField: (models.CharField, models.TextField),
+}
+
+NOT_PLAIN_FIELDS = (
+    serializers.BaseSerializer, serializers.SerializerMethodField, serializers.HiddenField,
+    RelatedField, ManyRelatedField,
+)
+
+
+@lru_cache(maxsize=settings.API_VALUES_PLANS_CACHE_SIZE)
+def get_values_plan(serializer_class, model, requested_fields):
+    """Builds plan of `values_list()` serialization if every requested field is a column of the model
+    or of a model joined by forward foreign keys
+
+    :param requested_fields: names of requested fields of the serializer (all fields if empty)
+    :return: `ValuesPlan` or None if some field needs a model instance
+    """
+    if (not issubclass(serializer_class, BaseSerializer) or
+            issubclass(serializer_class, serializers.ModelSerializer) or
+            serializer_class.to_representation is not BaseSerializer.to_representation):
+        return None
+
+    lookups, fields = [], []
+
+    for name, decl in serializer_class._declared_fields.items():
+        if decl.write_only or (requested_fields and name not in requested_fields):
+            continue
+        if isinstance(decl, NOT_PLAIN_FIELDS) or type(decl).get_attribute is not serializers.Field.get_attribute:
+            return None
+
+        source = decl.source or name
+        model_field = _get_column(model, source.split('.')) if source != '*' else None
+        if model_field is None:
+            return None
+
+        lookups.append(source.replace('.', '__'))
+        fields.append((name, not isinstance(model_field, IDENTITY_FIELDS.get(type(decl), ()))))
+
+    return ValuesPlan(lookups=tuple(lookups), fields=tuple(fields))
+
+
+def _get_column(model, attrs):
+    """Returns model field of the column `attrs` path points to (relations have to be forward single ones)"""
+    current_model = model
+    for i, attr in enumerate(attrs):
+        try:
+            field = current_model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            # e.g. `<fk>_id` attribute
+            field = next((f for f in current_model._meta.concrete_fields if f.attname == attr), None)
+            if field is None or i != len(attrs) - 1:
+                return None
+            return field.target_field
+
+        if not field.concrete:
+            return None  # reverse relations, many-to-many fields, etc.
+        if i == len(attrs) - 1:
+            # the last attribute of a relation is an object
+            return None if field.is_relation else field
+        if not field.is_relation or field.related_model is None or field.many_to_many:
+            return None
+        current_model = field.related_model
+    return None
+
+
+def serialize_values(plan, serializer_fields, rows):
+    """Converts `values_list()` rows to dicts, `serializer_fields` are bound fields used for conversions"""
+    converters = [
+        (i, name, serializer_fields[name].to_representation if convert else None)
+        for i, (name, convert) in enumerate(plan.fields)
+    ]
+    items = []
+    for row in rows:
+        item = {}
+        for i, name, convert in converters:
+            value = row[i]
+            item[name] = value if convert is None or value is None else convert(value)
+        items.append(item)
+    return items
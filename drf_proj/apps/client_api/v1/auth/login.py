@@ -24,6 +24,8 @@ class CredentialsValidatorV1M1P0(BaseValidator):
 
 # Serializer
 class UserSerializer(BaseSerializer):
+    compiled_representation = True
+
     id = serializers.IntegerField()
     email = serializers.EmailField()
     username = serializers.CharField()
@@ -94,6 +94,34 @@ API_DEPRECATED_VERSIONS = {
 API_PENDING_DEPRECATION_VERSIONS = {
     '0.0.2': '2020-12-31',
 }
+API_CAMELIZE_CACHE_SIZE = 4096  # max number of memoized snake_case -> camelCase keys
+API_FETCH_PLANS_CACHE_SIZE = 1024  # max number of inferred select_related/prefetch_related plans
+API_FETCHING_FIELDS_CACHE_SIZE = 1024  # max number of compiled `fields` query params
+API_QUERY_PARAMS_CACHE_SIZE = 4096  # max number of memoized camelCase -> snake_case query param keys/values
+API_COMPILED_REPRESENTATIONS_CACHE_SIZE = 1024  # max number of generated serializer `to_representation`s
+API_VALUES_PLANS_CACHE_SIZE = 1024  # max number of `values_list()` serialization plans
+API_FIELD_PROTOTYPES_CACHE_SIZE = 1024  # max number of cached pruned serializer field sets
+API_FIXED_RESPONSES_CACHE_SIZE = 1024  # max number of cached bodies of NotFound/MethodNotAllowed/etc responses
+API_RESPONSE_CACHE_ALIAS = 'default'  # cache of rendered responses of read views
+API_RESPONSE_CACHE_TIMEOUT = 300
+API_FRAGMENT_CACHE_ALIAS = 'default'  # cache of serialized collection items
+API_FRAGMENT_CACHE_TIMEOUT = 3600
+API_OBJECT_CACHE_ALIAS = 'default'  # read-through cache of `get_object` lookups
+API_OBJECT_CACHE_TIMEOUT = 300
+API_OBJECT_CACHE_NOT_FOUND_TIMEOUT = 30
+API_MAX_BODY_SIZE = 5 * 1024 * 1024  # limits of json request bodies (see `base_api.parsers`)
+API_MAX_BODY_DEPTH = 32
+API_MAX_BODY_ARRAY_LENGTH = 1000
+API_DELETE_JOBS_CACHE_ALIAS = 'default'  # progress of background collection deletes (has to be shared)
+API_DELETE_JOBS_TIMEOUT = 24 * 60 * 60
+API_DETECT_N_PLUS_ONE = False  # log repeated sql queries of api views
+API_QUERY_COUNT_HEADER = False  # add `X-Query-Count` header to api responses
+API_QUERY_BUDGET_STRICT = False  # raise an error when a view exceeds its `query_budget` (logged otherwise)
+API_LOG_DEFERRED_FIELDS_LOADING = True  # log lazy loading of fields deferred by `only()`/`defer()`
+API_JSON_ENCODER_BACKENDS = (  # the first installed one is used (see `base_api.json_backends`)
+    'rapidjson',
+    'json',
+)
 REST_FRAMEWORK = {
     'DEFAULT_VERSION': '1.1.0',
     'ALLOWED_VERSIONS': (
@@ -106,7 +134,7 @@ REST_FRAMEWORK = {
         'drf_proj.apps.base_api.renderers.VendorJsonRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'djangorestframework_camel_case.parser.CamelCaseJSONParser',
+        'drf_proj.apps.base_api.parsers.CamelCaseJSONParser',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.DjangoFilterBackend',
@@ -129,6 +157,7 @@ REST_FRAMEWORK = {
 PAGINATE_OFFSET_PARAM = 'offset'
 PAGINATE_PAGE_PARAM = 'page'
 PAGINATE_LIMIT_PARAM = 'limit'
+PAGINATE_CURSOR_PARAM = 'cursor'
 
 # CORS setup
 CORS_ORIGIN_ALLOW_ALL = False
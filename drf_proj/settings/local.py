@@ -6,6 +6,9 @@ SECRET_KEY = '%z#=i1irp$s4%g_gnv=-lt$$1@cvna(-15+a3om14ap1=+2iq)'
 ALLOWED_HOSTS = [
     '*',
 ]
+API_DETECT_N_PLUS_ONE = True
+API_QUERY_COUNT_HEADER = True
+API_QUERY_BUDGET_STRICT = True
 if DEBUG:
     REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
         'rest_framework.renderers.BrowsableAPIRenderer'
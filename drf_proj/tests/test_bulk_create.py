@@ -0,0 +1,65 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api.base_views import BaseView, CreationViewMixin
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class GroupSerializer(BaseSerializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class GroupValidator(serializers.Serializer):
+    name = serializers.CharField()
+
+
+class CustomCreateGroupValidator(GroupValidator):
+    def create(self, validated_data):
+        return Group.objects.create(name=validated_data['name'].upper())
+
+
+class PermissionsGroupValidator(GroupValidator):
+    permissions = serializers.PrimaryKeyRelatedField(many=True, queryset=Permission.objects.all())
+
+
+class GroupView(CreationViewMixin, BaseView):
+    queryset = Group.objects.all()
+    serializer_class = GroupSerializer
+    validator_class = GroupValidator
+    authentication_classes = ()
+    permission_classes = ()
+    allow_bulk_create = True
+
+
+class BulkCreateTestCase(TestCase):
+    def post(self, data, **initkwargs):
+        view = GroupView.as_view({'post': 'create'}, **initkwargs)
+        response = view(APIRequestFactory().post('/', data, format='json'))
+        response.render()
+        return response
+
+    def test_created_objects_have_pks(self):
+        response = self.post([{'name': 'first'}, {'name': 'second'}])
+
+        self.assertEqual(response.status_code, 201)
+        groups = list(Group.objects.order_by('pk').values('id', 'name'))
+        self.assertEqual(response.data, groups)
+        self.assertEqual([group['name'] for group in groups], ['first', 'second'])
+
+    def assert_refused(self, data, validator_class):
+        with self.assertLogs(level='ERROR'):
+            response = self.post(data, validator_class=validator_class)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIsInstance(response.data, ImproperlyConfigured)
+        self.assertFalse(Group.objects.exists())
+
+    def test_custom_create_is_refused(self):
+        self.assert_refused([{'name': 'first'}], CustomCreateGroupValidator)
+
+    def test_many_to_many_fields_are_refused(self):
+        self.assert_refused([{'name': 'first', 'permissions': []}], PermissionsGroupValidator)
@@ -0,0 +1,83 @@
+import json
+
+from django.contrib.auth.models import Group, Permission
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api.base_views import BaseView, UpdateViewMixin
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class GroupSerializer(BaseSerializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class GroupValidator(serializers.Serializer):
+    name = serializers.CharField()
+
+
+class CustomUpdateGroupValidator(GroupValidator):
+    def update(self, instance, validated_data):
+        instance.name = validated_data['name'].upper()
+        instance.save()
+        return instance
+
+
+class PermissionsGroupValidator(GroupValidator):
+    permissions = serializers.PrimaryKeyRelatedField(many=True, queryset=Permission.objects.all())
+
+
+class GroupView(UpdateViewMixin, BaseView):
+    queryset = Group.objects.all()
+    serializer_class = GroupSerializer
+    validator_class = GroupValidator
+    authentication_classes = ()
+    permission_classes = ()
+    allow_update_collection = True
+
+
+class BulkPartialUpdateTestCase(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name='group')
+
+    def patch(self, data, **initkwargs):
+        view = GroupView.as_view({'patch': 'partial_update'}, **initkwargs)
+        response = view(APIRequestFactory().patch('/', data, format='json'))
+        response.render()
+        return response
+
+    def test_update(self):
+        response = self.patch([{'id': self.group.pk, 'name': 'renamed'}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Group.objects.get().name, 'renamed')
+
+    def test_malformed_ids(self):
+        response = self.patch([
+            {'id': self.group.pk, 'name': 'renamed'},
+            {'id': 'abc', 'name': 'renamed'},
+            {'id': [1], 'name': 'renamed'},
+            {'id': self.group.pk + 1, 'name': 'renamed'},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        errors = {error['data']['field']: error['msg'] for error in json.loads(response.content.decode())['data']}
+        self.assertEqual(errors, {'1.id': 'Invalid value.', '2.id': 'Invalid value.', '3.id': 'Not found.'})
+        self.assertEqual(Group.objects.get().name, 'group')
+
+    def assert_refused(self, data, validator_class):
+        with self.assertLogs(level='ERROR'):
+            response = self.patch(data, validator_class=validator_class)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIsInstance(response.data, ImproperlyConfigured)
+        self.assertEqual(Group.objects.get().name, 'group')
+
+    def test_custom_update_is_refused(self):
+        self.assert_refused([{'id': self.group.pk, 'name': 'renamed'}], CustomUpdateGroupValidator)
+
+    def test_many_to_many_fields_are_refused(self):
+        self.assert_refused([{'id': self.group.pk, 'permissions': []}], PermissionsGroupValidator)
@@ -0,0 +1,113 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.routers import SimpleRouter
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from drf_proj.apps.base_api import collection_delete
+from drf_proj.apps.base_api.base_views import BackgroundDestroyViewMixin, CRUDMixin
+from drf_proj.apps.base_api.collection_delete import delete_in_chunks
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class GroupSerializer(BaseSerializer):
+    name = serializers.CharField()
+
+
+class GroupView(CRUDMixin):
+    queryset = Group.objects.all()
+    serializer_class = GroupSerializer
+    authentication_classes = ()
+    permission_classes = ()
+    allow_destroy_collection = True
+    destroy_collection_strategy = 'chunked'
+    destroy_batch_size = 2
+
+
+class BackgroundGroupView(BackgroundDestroyViewMixin, GroupView):
+    pass
+
+
+class ChunkedDeleteTestCase(TestCase):
+    def setUp(self):
+        Group.objects.bulk_create([Group(name='group{}'.format(i)) for i in range(7)])
+
+    def test_delete_in_chunks(self):
+        progress = []
+        deleted = delete_in_chunks(Group.objects.exclude(name='group0'), batch_size=3, progress=progress.append)
+
+        self.assertEqual(deleted, 6)
+        self.assertEqual(progress, [3, 6])
+        self.assertEqual(list(Group.objects.values_list('name', flat=True)), ['group0'])
+
+    def test_chunked_strategy(self):
+        view = GroupView.as_view({'delete': 'destroy'})
+        with CaptureQueriesContext(connection) as queries:
+            response = view(APIRequestFactory().delete('/'))
+
+        self.assertEqual(response.status_code, 204)
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE FROM "auth_group" ')]
+        self.assertEqual(len(deletes), 4)  # by batches of `destroy_batch_size`
+        self.assertFalse(Group.objects.exists())
+
+    def test_background_strategy_requires_mixin(self):
+        view = GroupView.as_view({'delete': 'destroy'}, destroy_collection_strategy='background')
+        with self.assertLogs(level='ERROR'):
+            response = view(APIRequestFactory().delete('/'))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(Group.objects.count(), 7)
+
+
+class RouterTestCase(TestCase):
+    def get_urls(self, viewset):
+        router = SimpleRouter()
+        router.register('groups', viewset, base_name='groups')
+        return [url.regex.pattern for url in router.urls]
+
+    def test_delete_jobs_route(self):
+        self.assertEqual([url for url in self.get_urls(GroupView) if 'delete-jobs' in url], [])
+        self.assertIn(
+            '^groups/delete-jobs/(?P<job_id>[0-9a-f]+)/$', self.get_urls(BackgroundGroupView))
+
+
+class BackgroundDeleteTestCase(TransactionTestCase):
+    def setUp(self):
+        Group.objects.bulk_create([Group(name='group{}'.format(i)) for i in range(5)])
+        self.user = User.objects.create(username='user')
+
+    def request(self, action, method, user, **kwargs):
+        request = getattr(APIRequestFactory(), method)('/')
+        force_authenticate(request, user=user)
+        return BackgroundGroupView.as_view({method: action})(request, **kwargs)
+
+    def start_job(self):
+        response = self.request('destroy', 'delete', self.user)
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['id']
+        for thread in threading.enumerate():
+            if thread.name == 'api-delete-job-{}'.format(job_id):
+                thread.join(5)
+        return job_id
+
+    def test_job(self):
+        job_id = self.start_job()
+
+        response = self.request('delete_job', 'get', self.user, job_id=job_id)
+        self.assertEqual(response.data, {'id': job_id, 'status': 'done', 'total': 5, 'deleted': 5, 'error': None})
+        self.assertFalse(Group.objects.exists())
+
+        other_user = User.objects.create(username='other')
+        self.assertEqual(self.request('delete_job', 'get', other_user, job_id=job_id).status_code, 404)
+
+    def test_failed_worker(self):
+        with mock.patch.object(collection_delete, 'delete_in_chunks', side_effect=SystemExit(1)), \
+                self.assertLogs(collection_delete.logger, level='ERROR'):
+            job_id = self.start_job()
+
+        self.assertEqual(collection_delete.get_job(job_id)['status'], collection_delete.FAILED)
@@ -0,0 +1,19 @@
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+
+from drf_proj.apps.base_api.counters import EstimatedCount
+
+
+class EstimatedCountTestCase(TestCase):
+    def test_sqlite_estimate_of_indexed_table(self):
+        Group.objects.bulk_create([Group(name=str(i)) for i in range(5)])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE auth_group')
+            cursor.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'auth_group'")
+            self.assertNotIn(None, [row[0] for row in cursor.fetchall()])  # there are index rows only
+        Group.objects.create(name='not analyzed')
+
+        with self.assertNumQueries(2):
+            self.assertEqual(EstimatedCount().count(Group.objects.all()), 5)
+        self.assertEqual(EstimatedCount().count(Group.objects.filter(name='1')), 1)
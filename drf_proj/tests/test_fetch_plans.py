@@ -0,0 +1,74 @@
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+
+from drf_proj.apps.base_api.fetch_plans import build_prefetches, get_fetch_plan
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class PermissionSerializer(BaseSerializer):
+    codename = serializers.CharField()
+
+
+class ContentTypeSerializer(BaseSerializer):
+    model = serializers.CharField()
+    permissions = PermissionSerializer(source='permission_set', many=True)
+
+
+class GroupSerializer(BaseSerializer):
+    name = serializers.CharField()
+    permissions = PermissionSerializer(many=True)
+
+
+class FetchPlanTestCase(TestCase):
+    def test_reverse_foreign_key_accessor(self):
+        plan = get_fetch_plan(ContentTypeSerializer, ContentType, frozenset())
+
+        self.assertEqual([prefetch.lookup for prefetch in plan.prefetch_related], ['permission_set'])
+        self.assertEqual(plan.prefetch_related[0].fk_name, 'content_type')
+
+        queryset = ContentType.objects.prefetch_related(*build_prefetches(plan, only=True))
+        with self.assertNumQueries(2):
+            data = ContentTypeSerializer(queryset, many=True).data
+        self.assertEqual(
+            sorted(p['codename'] for item in data for p in item['permissions']),
+            sorted(Permission.objects.values_list('codename', flat=True)))
+
+    def test_many_to_many(self):
+        plan = get_fetch_plan(GroupSerializer, Group, frozenset())
+
+        self.assertEqual([prefetch.lookup for prefetch in plan.prefetch_related], ['permissions'])
+
+    def test_reverse_foreign_key_limit(self):
+        plan = get_fetch_plan(ContentTypeSerializer, ContentType, frozenset())
+
+        queryset = ContentType.objects.prefetch_related(*build_prefetches(plan, limits={'permission_set': 2}))
+        counts = [len(content_type.permission_set.all()) for content_type in queryset]
+        self.assertEqual(max(counts), 2)
+        self.assertEqual(
+            counts, [min(content_type.permission_set.count(), 2) for content_type in ContentType.objects.all()])
+
+    def test_reverse_foreign_key_limit_ranks_prefetched_parents(self):
+        plan = get_fetch_plan(ContentTypeSerializer, ContentType, frozenset())
+        parents = ContentType.objects.filter(permission__isnull=False).distinct().order_by('pk')[:2]
+
+        queryset = ContentType.objects.filter(pk__in=list(parents.values_list('pk', flat=True)))
+        with CaptureQueriesContext(connection) as queries:
+            counts = [len(content_type.permission_set.all()) for content_type in
+                      queryset.prefetch_related(*build_prefetches(plan, limits={'permission_set': 1}))]
+
+        self.assertEqual(counts, [1, 1])
+        # the ranking subquery is not correlated with the outer query
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"api_limited"."content_type_id" IN ({}, {})'.format(*(p.pk for p in parents)), sql)
+        self.assertNotIn('"api_limited"."content_type_id" = ', sql)
+
+    def test_many_to_many_limit(self):
+        plan = get_fetch_plan(GroupSerializer, Group, frozenset())
+
+        with self.assertRaises(ImproperlyConfigured):
+            build_prefetches(plan, limits={'permissions': 2})
@@ -0,0 +1,43 @@
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from drf_proj.apps.base_api.instrumentation import QueryCollector
+
+
+class QueryCollectorTestCase(TestCase):
+    def test_connection_queries_are_logged(self):
+        with self.assertNumQueries(2):
+            with QueryCollector() as queries:
+                list(Group.objects.all())
+                list(Group.objects.all())
+
+        self.assertEqual(queries.count, 2)
+
+    def test_nested_collectors(self):
+        with CaptureQueriesContext(connection) as captured:
+            with QueryCollector() as outer:
+                with QueryCollector() as inner:
+                    list(Group.objects.all())
+
+        self.assertEqual((len(captured), outer.count, inner.count), (1, 1, 1))
+
+    def test_queries_are_not_logged_by_default(self):
+        with QueryCollector() as queries:
+            list(Group.objects.all())
+
+        self.assertEqual(queries.count, 1)
+        self.assertFalse(connection.queries_logged)
+
+    def test_repeated_queries(self):
+        queries = QueryCollector()
+        for i in range(3):
+            queries.add('BEGIN', 0)
+            queries.add('SAVEPOINT "s1_x1"', 0)
+            queries.add('SELECT "name" FROM "auth_group" WHERE "id" IN (%s, %s)', 0)
+            queries.add('RELEASE SAVEPOINT "s1_x1"', 0)
+
+        self.assertEqual(
+            [query.sql for query in queries.repeated(threshold=3)],
+            ['SELECT "name" FROM "auth_group" WHERE "id" IN (%s...)'])
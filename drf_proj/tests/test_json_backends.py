@@ -0,0 +1,78 @@
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from importlib import import_module
+import random
+import struct
+from unittest import skipUnless
+import uuid
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from drf_proj.apps.base_api.json_backends import StdlibJsonBackend, json_backends
+from drf_proj.apps.base_api.renderers import JsonRenderer
+
+
+def is_installed(name):
+    try:
+        import_module(name)
+    except ImportError:
+        return False
+    return True
+
+
+def get_floats(count):
+    rnd = random.Random(0)
+    floats = [
+        0.0, -0.0, 0.1, 0.0001, 0.00001, 1e-05, 1e-07, 2.5e-10, 5e-324, 123.0, 1e15, 1e16, 1e22,
+        1.7976931348623157e308, 2.0 ** 53 + 2,
+    ]
+    for _ in range(count):
+        floats.append(rnd.random() * 10 ** rnd.randint(-30, 30))
+        value = struct.unpack('d', struct.pack('Q', rnd.getrandbits(64)))[0]
+        if value == value and abs(value) != float('inf'):
+            floats.append(value)
+    return floats
+
+
+FINITE_PAYLOADS = [
+    {'floats': get_floats(5000)},
+    [2 ** 53 + 1, -2 ** 63, 2 ** 64, 10 ** 30],
+    ['é', '  ', '</script>', ''.join(map(chr, range(32))), '\x7f', '😀', 'a/b', '"\\', 'userInfo 1e-7 Inf'],
+    [datetime(2020, 1, 2, 3, 4, 5, 678901), datetime(2020, 1, 2, tzinfo=timezone.utc), date(2020, 1, 2),
+     time(1, 2, 3), Decimal('1.10'), uuid.UUID(int=5)],
+    {1: 'a', 'b': {2.5: True, None: False}},
+    {'nested': [None, True, False, {}, [], (1, 2)]},
+    1e-07,
+]
+PAYLOADS = FINITE_PAYLOADS + [[float('nan'), float('inf'), -float('inf')], float('inf')]
+
+
+class JsonBackendsParityTestCase(SimpleTestCase):
+    """Backends produce byte-for-byte the same output as stdlib json"""
+    def assert_parity(self, name, payloads):
+        backend_class = json_backends[name]
+        if not is_installed(name):
+            self.skipTest('{} is not installed'.format(name))
+
+        for ensure_ascii in (False, True):
+            if not backend_class.supports(ensure_ascii, (',', ':')):
+                continue
+            backend = backend_class(JsonRenderer.encoder_class, ensure_ascii, (',', ':'))
+            stdlib = StdlibJsonBackend(JsonRenderer.encoder_class, ensure_ascii, (',', ':'))
+            for payload in payloads:
+                self.assertEqual(backend.dumps(payload), stdlib.dumps(payload), (name, ensure_ascii))
+
+    def test_default_backends(self):
+        for name in settings.API_JSON_ENCODER_BACKENDS:
+            with self.subTest(backend=name):
+                self.assert_parity(name, PAYLOADS)
+
+    @skipUnless(is_installed('ujson'), 'ujson is not installed')
+    def test_ujson(self):
+        self.assert_parity('ujson', PAYLOADS)
+
+    @skipUnless(is_installed('orjson'), 'orjson is not installed')
+    def test_orjson(self):
+        # NaN/Infinity are encoded as `null`, so orjson isn't in the default backends
+        self.assert_parity('orjson', FINITE_PAYLOADS)
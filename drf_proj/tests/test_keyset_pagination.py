@@ -0,0 +1,72 @@
+import base64
+import datetime
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api.base_views import BaseReadView
+from drf_proj.apps.base_api.ordering_backend import CustomOrderingBackend
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class UserSerializer(BaseSerializer):
+    username = serializers.CharField()
+
+
+class UserView(BaseReadView):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    authentication_classes = ()
+    permission_classes = ()
+    filter_backends = (CustomOrderingBackend,)
+    ordering_fields = ('username', 'date_joined', 'last_login')
+    keyset_pagination = True
+
+
+def encode_cursor(ordering, values):
+    return base64.urlsafe_b64encode(json.dumps([ordering, values]).encode()).decode()
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        joined = timezone.now()
+        for i in range(5):
+            # the same `date_joined` of pairs of users, so pages are split by pk
+            User.objects.create(username='user{}'.format(i), date_joined=joined + datetime.timedelta(days=i // 2))
+
+    def list(self, **params):
+        response = UserView.as_view({'get': 'list'})(APIRequestFactory().get('/', params))
+        response.render()
+        return response.status_code, json.loads(response.content.decode())
+
+    def test_pages(self):
+        usernames, cursor = [], None
+        while True:
+            status, content = self.list(sorting='-dateJoined', limit=2, **({'cursor': cursor} if cursor else {}))
+            self.assertEqual(status, 200)
+            usernames.extend(item['username'] for item in content['data'])
+            cursor = content['meta']['nextCursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(usernames, ['user4', 'user3', 'user2', 'user1', 'user0'])
+
+    def test_tampered_cursor(self):
+        ordering = ['-date_joined', '-pk']
+        for cursor in ('abc', encode_cursor(ordering, ['2020-01-01T00:00:00', 'abc']),
+                       encode_cursor(ordering, ['yesterday', 1]), encode_cursor(ordering, [None, 1]),
+                       encode_cursor(ordering, [[1], 1]), encode_cursor(['-pk'], [1])):
+            status, content = self.list(sorting='-dateJoined', cursor=cursor)
+
+            self.assertEqual(status, 400)
+            self.assertEqual(content['data']['data']['field'], 'cursor')
+
+    def test_nullable_ordering_field(self):
+        status, content = self.list(sorting='lastLogin')
+
+        self.assertEqual(status, 400)
+        self.assertEqual(content['data']['data']['field'], 'sorting')
@@ -0,0 +1,88 @@
+from django.contrib.auth.models import Group, User
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api import object_cache
+from drf_proj.apps.base_api.base_views import BaseReadView, UpdateViewMixin
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class UserSerializer(BaseSerializer):
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    email = serializers.CharField()
+
+
+class UserValidator(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('first_name',)
+
+
+class UserView(UpdateViewMixin, BaseReadView):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    validator_class = UserValidator
+    authentication_classes = ()
+    permission_classes = ()
+    cache_objects = True
+
+
+class ObjectCacheTestCase(TestCase):
+    def setUp(self):
+        caches[settings.API_OBJECT_CACHE_ALIAS].clear()
+        self.user = User.objects.create(username='user', first_name='first', email='old@example.com')
+
+    def request(self, method, data=None):
+        view = UserView.as_view({'get': 'retrieve', 'patch': 'partial_update'})
+        response = view(getattr(APIRequestFactory(), method)('/', data, format='json'), pk=self.user.pk)
+        response.render()
+        return response
+
+    def test_retrieve_is_cached(self):
+        self.request('get')
+
+        with self.assertNumQueries(0):
+            response = self.request('get')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_fetches_fresh_object(self):
+        self.request('get')
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')  # doesn't invalidate the cache
+
+        response = self.request('patch', {'firstName': 'renamed'})
+
+        self.assertEqual(response.status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual((user.first_name, user.email), ('renamed', 'new@example.com'))
+
+    def test_save_invalidates_object(self):
+        self.request('get')
+        self.user.first_name = 'renamed'
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            self.request('get')
+
+    def test_stale_object_is_cached_under_outdated_key(self):
+        key = object_cache.get_object_key(User, 'pk', self.user.pk)
+        stale = User.objects.get(pk=self.user.pk)
+        object_cache.connect_invalidation(User, 'pk')
+        self.user.save()  # concurrent change between the lookup and caching of the object
+
+        object_cache.cache_object(key, stale, timeout=60)
+
+        fresh_key = object_cache.get_object_key(User, 'pk', self.user.pk)
+        self.assertNotEqual(fresh_key, key)
+        self.assertIsNone(object_cache.get_cached_object(fresh_key))
+
+    def test_model_invalidation(self):
+        key = object_cache.get_object_key(Group, 'pk', 1)
+
+        object_cache.invalidate_model_objects(Group)
+
+        self.assertNotEqual(object_cache.get_object_key(Group, 'pk', 1), key)
@@ -0,0 +1,79 @@
+import io
+
+from django import forms
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django_filters import FilterSet, MultipleChoiceFilter
+from rest_framework.filters import DjangoFilterBackend
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api.exceptions import RequestEntityTooLarge
+from drf_proj.apps.base_api.parsers import CamelCaseJSONParser, CamelCaseQueryStringParser
+
+
+class UserFilter(FilterSet):
+    user_name = MultipleChoiceFilter(name='username', choices=[(name, name) for name in 'abc'])
+
+    class Meta:
+        model = User
+        fields = ['user_name']
+
+
+class UserFilterView(object):
+    filter_class = UserFilter
+
+
+class CamelCaseQueryParamsTestCase(TestCase):
+    def get_request(self, query_string):
+        return Request(APIRequestFactory().get('/?' + query_string))
+
+    def test_keys_and_values(self):
+        params = CamelCaseQueryStringParser.parse(self.get_request('userName=a&fields=firstName,,lastName'))
+
+        self.assertEqual(sorted(params), ['fields', 'user_name'])
+        self.assertEqual(params['user_name'], 'a')
+        self.assertEqual(params.get_terms('fields'), ('first_name', 'last_name'))
+        self.assertNotIn('userName', params)
+
+    def test_multiple_values(self):
+        params = CamelCaseQueryStringParser.parse(self.get_request('userName=a&userName=b'))
+
+        self.assertEqual(params.getlist('user_name'), ['a', 'b'])
+        self.assertEqual(params['user_name'], 'b')
+        self.assertEqual(forms.SelectMultiple().value_from_datadict(params, {}, 'user_name'), ['a', 'b'])
+
+    def test_copy_is_mutable_query_dict(self):
+        params = CamelCaseQueryStringParser.parse(self.get_request('userName=a&userName=b'))
+
+        copy = params.copy()
+        copy['page'] = '2'
+        self.assertEqual(copy.getlist('user_name'), ['a', 'b'])
+        self.assertNotIn('page', params)
+        with self.assertRaises(AttributeError):
+            params['page'] = '2'
+
+    def test_multiple_choice_filter(self):
+        for name in 'abc':
+            User.objects.create(username=name)
+        request = self.get_request('userName=a&userName=b')
+        self.assertNotIn('userName', request.query_params)
+
+        queryset = DjangoFilterBackend().filter_queryset(request, User.objects.all(), UserFilterView())
+
+        self.assertEqual(sorted(queryset.values_list('username', flat=True)), ['a', 'b'])
+
+
+class CamelCaseJSONParserTestCase(TestCase):
+    def parse(self, body):
+        return CamelCaseJSONParser().parse(io.BytesIO(body.encode()))
+
+    def test_keys(self):
+        self.assertEqual(self.parse('{"firstName": [{"lastName": 1}]}'), {'first_name': [{'last_name': 1}]})
+
+    def test_depth_limit(self):
+        depth = CamelCaseJSONParser.max_depth + 1
+        for body in ('[' * depth + ']' * depth, '{"a":' * depth + '1' + '}' * depth,
+                     '[' * 5000, '{"a":' * 5000, '[' * 100000 + ']' * 100000):
+            with self.assertRaises(RequestEntityTooLarge):
+                self.parse(body)
@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from drf_proj.apps.base_api.codes import Code, Codes
+from drf_proj.apps.base_api.exceptions import ApiValidationError
+from drf_proj.apps.base_api.patch import pack_validation_message
+from drf_proj.apps.base_api.renderers import JsonRenderer
+
+
+class ValidationErrorsTestCase(SimpleTestCase):
+    def transform(self, detail):
+        # codes are not copied for each error
+        with mock.patch.object(Code, '__call__', side_effect=AssertionError):
+            return JsonRenderer()._transform_response(ApiValidationError(detail))
+
+    def test_field_errors(self):
+        response = self.transform({
+            'name': [pack_validation_message('Too long.', Codes.ValidationAliases.MAX_LENGTH, 'case', {'max': 3})],
+            'user_id': [pack_validation_message('Invalid value.', Codes.ValidationAliases.INVALID)],
+        })
+
+        self.assertEqual(response['code'], Codes.MULTIPLE_ERRORS.code_value)
+        self.assertEqual(sorted(response['data'], key=lambda error: error['code']), [
+            {'code': Codes.INVALID_VALUE.code_value, 'status': 'InvalidValue', 'msg': 'Invalid value.',
+             'data': {'field': 'userId'}},
+            {'code': Codes.MAX_STRING_LENGTH.code_value, 'status': 'MaxStringValueLimit', 'msg': 'Too long.',
+             'case': 'case', 'data': {'field': 'name', 'max': 3}},
+        ])
+
+    def test_non_field_error(self):
+        response = self.transform([pack_validation_message('Invalid value.', Codes.ValidationAliases.INVALID)])
+
+        self.assertEqual(response['data'], {
+            'code': Codes.INVALID_VALUE.code_value, 'status': 'InvalidValue', 'msg': 'Invalid value.'})
@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class UserSerializer(BaseSerializer):
+    compiled_representation = True
+
+    id = serializers.IntegerField()
+    username = serializers.CharField()
+    full_name = serializers.CharField(source='get_full_name')
+    label = serializers.SerializerMethodField()
+
+    def get_label(self, obj):
+        return '{}#{}'.format(obj.username, obj.pk)
+
+
+class GenericUserSerializer(UserSerializer):
+    compiled_representation = False
+
+
+class CompiledRepresentationTestCase(SimpleTestCase):
+    def test_parity_with_generic_representation(self):
+        users = [User(id=i, username='user{}'.format(i), first_name='First', last_name=str(i)) for i in range(3)]
+
+        self.assertEqual(
+            UserSerializer(users, many=True).data,
+            [dict(item) for item in GenericUserSerializer(users, many=True).data])
+
+    def test_benchmark_command(self):
+        stdout = StringIO()
+        call_command('benchmark_representation', rows=100, repeat=1, stdout=stdout)
+
+        self.assertIn('speedup', stdout.getvalue())
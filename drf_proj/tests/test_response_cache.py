@@ -0,0 +1,62 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.conf import settings
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from drf_proj.apps.base_api.base_views import BaseReadView
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class GroupSerializer(BaseSerializer):
+    name = serializers.CharField()
+
+
+class IsStaff(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return request.user.is_staff
+
+
+class GroupView(BaseReadView):
+    queryset = Group.objects.all()
+    serializer_class = GroupSerializer
+    authentication_classes = ()
+    permission_classes = (IsStaff,)
+    cache_responses = True
+    response_cache_scope = 'shared'
+
+    def get_object_validators(self, obj):
+        return self._make_etag(obj.pk, obj.name), None
+
+
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        caches[settings.API_RESPONSE_CACHE_ALIAS].clear()
+        self.group = Group.objects.create(name='group')
+        self.staff = User.objects.create(username='staff', is_staff=True)
+        self.user = User.objects.create(username='user')
+        self.view = GroupView.as_view({'get': 'retrieve'})
+
+    def retrieve(self, user, **headers):
+        request = APIRequestFactory().get('/', **headers)
+        force_authenticate(request, user=user)
+        response = self.view(request, pk=self.group.pk)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_cached_response_is_not_modified(self):
+        etag = self.retrieve(self.staff)['ETag']
+
+        with self.assertNumQueries(1):  # object permissions are checked on the hit
+            response = self.retrieve(self.staff, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_object_permissions_are_checked_on_hit(self):
+        self.assertEqual(self.retrieve(self.staff).status_code, 200)
+
+        self.assertEqual(self.retrieve(self.user).status_code, 403)
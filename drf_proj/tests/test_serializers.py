@@ -0,0 +1,44 @@
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase
+from rest_framework import serializers
+
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class ChildSerializer(BaseSerializer):
+    name = serializers.CharField()
+
+
+class ParentSerializer(BaseSerializer):
+    title = serializers.CharField()
+    children = ChildSerializer(many=True)
+    numbers = serializers.ListField(child=serializers.IntegerField())
+
+
+class GroupSerializer(BaseSerializer):
+    name = serializers.CharField()
+    permissions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+
+class CachedFieldsTestCase(TestCase):
+    def test_nested_many_serializer(self):
+        for title in ('first', 'second'):  # the second one is built from cached field prototypes
+            data = ParentSerializer({'title': title, 'children': [{'name': 'a'}, {'name': 'b'}], 'numbers': [1]}).data
+            self.assertEqual(data['title'], title)
+            self.assertEqual([dict(c) for c in data['children']], [{'name': 'a'}, {'name': 'b'}])
+            self.assertEqual(data['numbers'], [1])
+
+    def test_children_are_bound_to_copies(self):
+        first, second = ParentSerializer(), ParentSerializer()
+        self.assertIsNot(first.fields['children'], second.fields['children'])
+        self.assertIs(first.fields['children'].child.parent, first.fields['children'])
+        self.assertIs(second.fields['numbers'].child.parent, second.fields['numbers'])
+
+    def test_many_related_field(self):
+        group = Group.objects.create(name='staff')
+        permissions = list(Permission.objects.order_by('pk')[:2])
+        group.permissions.set(permissions)
+
+        for _ in range(2):
+            data = GroupSerializer(group).data
+            self.assertEqual(sorted(data['permissions']), [p.pk for p in permissions])
@@ -0,0 +1,38 @@
+import json
+
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from drf_proj.apps.base_api.base_views import BaseReadView
+from drf_proj.apps.base_api.serializers import BaseSerializer
+
+
+class GroupSerializer(BaseSerializer):
+    name = serializers.CharField()
+    permissions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+
+class GroupView(BaseReadView):
+    queryset = Group.objects.prefetch_related('permissions').order_by('-name')
+    serializer_class = GroupSerializer
+    authentication_classes = ()
+    permission_classes = ()
+    stream_collection = True
+    stream_chunk_size = 10
+
+
+class StreamingTestCase(TestCase):
+    def test_chunks(self):
+        permission = Permission.objects.first()
+        for i in range(25):
+            Group.objects.create(name='group{:02}'.format(i)).permissions.add(permission)
+
+        view = GroupView.as_view({'get': 'list'})
+        response = view(APIRequestFactory().get('/', {'offset': 2, 'limit': 21}))
+        with self.assertNumQueries(1 + 3 * 2):  # pks, then items and their permissions by chunks
+            data = json.loads(b''.join(response.streaming_content).decode())['data']
+
+        self.assertEqual(
+            data, [{'name': 'group{:02}'.format(i), 'permissions': [permission.pk]} for i in range(22, 1, -1)])
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import serializers
+
+from drf_proj.apps.base_api.serializers import BaseSerializer
+from drf_proj.apps.base_api.values_plans import get_values_plan, serialize_values
+
+
+class UpperCharField(serializers.CharField):
+    def to_representation(self, value):
+        return super(UpperCharField, self).to_representation(value).upper()
+
+
+class UserSerializer(BaseSerializer):
+    id = serializers.IntegerField()
+    str_id = serializers.CharField(source='id')
+    username = serializers.CharField()
+    upper_username = UpperCharField(source='username')
+    email = serializers.ReadOnlyField()
+    is_staff = serializers.BooleanField()
+    staff = serializers.CharField(source='is_staff')
+    date_joined = serializers.DateTimeField()
+    last_login = serializers.DateTimeField()
+
+
+class ValuesPlanTestCase(TestCase):
+    def setUp(self):
+        User.objects.create(username='first', email='first@example.com', is_staff=True)
+        User.objects.create(username='second')
+
+    def test_parity_with_serializer(self):
+        plan = get_values_plan(UserSerializer, User, frozenset())
+        self.assertIsNotNone(plan)
+
+        queryset = User.objects.order_by('pk')
+        rows = queryset.values_list(*plan.lookups)
+        serialized = serialize_values(plan, UserSerializer().fields, rows)
+
+        self.assertEqual(serialized, UserSerializer(queryset, many=True).data)
+        self.assertEqual(serialized[0]['str_id'], str(serialized[0]['id']))
+        self.assertEqual(serialized[0]['upper_username'], 'FIRST')
+
+    def test_identity_fields_are_not_converted(self):
+        plan = get_values_plan(UserSerializer, User, frozenset())
+
+        self.assertEqual(
+            [name for name, convert in plan.fields if not convert], ['id', 'username', 'email', 'is_staff'])